@@ -0,0 +1,56 @@
+"""
+Cold-start benchmark: wall time of fresh interpreters importing the pipeline.
+
+Usage: python benchmarks/import_time.py [--repeat N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CASES = [
+    ("python startup", "pass"),
+    ("import src.core", "import src.core"),
+    ("SourceRetriever()", "from src.core import SourceRetriever; SourceRetriever().close()"),
+    ("CLI --help", None),
+    ("import requests", "import requests"),
+    ("import pandas", "import pandas"),
+    ("import bs4", "import bs4"),
+    ("import newspaper", "import newspaper"),
+    ("import google.generativeai", "import google.generativeai"),
+]
+
+
+def time_command(command, repeat: int) -> float:
+    """Median wall time in milliseconds over repeat fresh processes."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start import time')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case (default: 5)')
+    args = parser.parse_args()
+
+    for name, code in CASES:
+        if code is None:
+            command = [sys.executable, str(ROOT / "src" / "core" / "source_retrieval.py"), "--help"]
+        else:
+            command = [sys.executable, "-c", code]
+        try:
+            print(f"{name:<28} {time_command(command, args.repeat):8.1f} ms")
+        except subprocess.CalledProcessError:
+            print(f"{name:<28} {'failed':>8}")
+
+
+if __name__ == "__main__":
+    main()
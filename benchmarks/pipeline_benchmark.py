@@ -0,0 +1,246 @@
+"""
+Offline end-to-end benchmark of the retrieval pipeline.
+
+Search pages, article HTML and Gemini replies are replayed from a fixture
+directory, so runs are reproducible and comparable. Fixtures are seeded from
+the run_test claims and data/*.csv, or recorded from live traffic with
+--record.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py --seed
+    python benchmarks/pipeline_benchmark.py --verify --latency-ms 50 --output before.json
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import html
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import quote, urlencode, urlparse
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.core.async_retrieval import run_batch_async  # noqa: E402
+from src.core.batch import run_batch  # noqa: E402
+from src.core.llm import GeminiClient  # noqa: E402
+from src.core.ranking import tokenize  # noqa: E402
+from src.core.replay import (  # noqa: E402
+    FixtureStore, RecordingModel, ReplayModel, recording_session, replay_session
+)
+from src.core.search_backends import LocalCorpusBackend  # noqa: E402
+from src.core.source_retrieval import (  # noqa: E402
+    DUCKDUCKGO_URL, TEST_CLAIMS, SourceRetriever, decompose_prompt
+)
+from src.core.timing import STAGES  # noqa: E402
+from src.core.url_utils import url_key  # noqa: E402
+
+DEFAULT_FIXTURES = ROOT / "benchmarks" / "fixtures"
+
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+def load_dataset() -> List[Dict[str, str]]:
+    rows = []
+    for path in sorted((ROOT / "data").glob("*.csv")):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def benchmark_claims(rows: List[Dict[str, str]]) -> List[str]:
+    claims = list(TEST_CLAIMS)
+    for row in rows:
+        if row["claim"] not in claims:
+            claims.append(row["claim"])
+    return claims
+
+
+def sub_queries(claim: str) -> List[str]:
+    """Deterministic stand-ins for Gemini's claim decomposition: keyword groups of the claim."""
+    keywords = list(dict.fromkeys(tokenize(claim)))
+    return [" ".join(keywords[i:i + 5]) for i in range(0, min(len(keywords), 10), 5)]
+
+
+def article_html(url: str, content: str) -> str:
+    slug = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or urlparse(url).netloc
+    title = slug.replace("-", " ").replace("_", " ").capitalize()
+    paragraphs = "".join(
+        f"<p>{html.escape(paragraph.strip())}</p>\n" for paragraph in content.split("\n") if paragraph.strip()
+    )
+    return (f"<html><head><title>{html.escape(title)}</title></head>"
+            f"<body><article><h1>{html.escape(title)}</h1>\n{paragraphs}</article></body></html>")
+
+
+def search_page(urls: List[str]) -> str:
+    links = "".join(
+        f'<div class="result"><a class="result__a" href="//duckduckgo.com/l/?uddg={quote(url, safe="")}">'
+        f"{html.escape(url)}</a></div>\n"
+        for url in urls
+    )
+    return f"<html><body>{links}</body></html>"
+
+
+def seed_fixtures(store: FixtureStore, results_per_query: int = 10):
+    """Write synthetic but realistic fixtures from the dataset: pages, search results and decompositions."""
+    rows = load_dataset()
+    for row in rows:
+        # Pipelines fetch URLs as found, so fixtures are keyed on the dataset's URLs
+        url = row["url"].strip()
+        if url_key(url) and row.get("content"):
+            body = article_html(url, row["content"]).encode("utf-8")
+            store.put_http(url, 200, {
+                "Content-Type": "text/html; charset=utf-8",
+                "ETag": f'"{hashlib.sha256(body).hexdigest()[:16]}"',
+            }, body)
+
+    corpus = LocalCorpusBackend(rows)
+    for claim in benchmark_claims(rows):
+        queries = sub_queries(claim)
+        store.put_gemini(decompose_prompt(claim), json.dumps({"search_queries": queries}))
+        own = [row["url"] for row in rows if row["claim"] == claim]
+        for query in [claim] + queries:
+            urls = list(dict.fromkeys(own + corpus.search(query, results_per_query)))[:results_per_query]
+            store.put_http(f"{DUCKDUCKGO_URL}?{urlencode({'q': query})}", 200,
+                           {"Content-Type": "text/html; charset=utf-8"}, search_page(urls).encode("utf-8"))
+    store.save()
+    print(f"Seeded {len(store.index['http'])} HTTP fixtures and "
+          f"{len(store.index['gemini'])} Gemini fixtures in {store.path}")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def stage_report(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    report = {}
+    for stage in STAGES:
+        durations = [span["duration_ms"] for span in spans if span["stage"] == stage]
+        if durations:
+            report[stage] = {
+                "count": len(durations),
+                "mean_ms": round(statistics.mean(durations), 3),
+                "p50_ms": round(percentile(durations, 50), 3),
+                "p95_ms": round(percentile(durations, 95), 3),
+                "max_ms": round(max(durations), 3),
+                "total_ms": round(sum(durations), 3),
+            }
+    return report
+
+
+def run_once(args, store: FixtureStore, claims: List[str], timings_path: str) -> float:
+    session = recording_session(store) if args.record else replay_session(store, args.latency_ms / 1000)
+    llm_client = None
+    if args.verify:
+        if args.record:
+            llm_client = RecordingModel(GeminiClient(args.gemini_key), store)
+        else:
+            llm_client = ReplayModel(store, args.gemini_latency_ms / 1000)
+    retriever = SourceRetriever(
+        session=session,
+        llm_client=llm_client,
+        max_workers=args.max_workers,
+        parse_workers=args.parse_workers,
+        # Politeness limits only matter against live sites
+        search_rate=2.0 if args.record else 0,
+        host_rate=1.0 if args.record else 0,
+        timings_path=timings_path,
+    )
+    started = time.perf_counter()
+    if args.use_async:
+        # aiohttp would bypass the replay and recording adapters, so download on its threads
+        asyncio.run(run_batch_async(retriever, claims, args.num_results, args.verify,
+                                    args.claim_workers, native_http=False))
+    else:
+        run_batch(retriever, claims, args.num_results, args.verify, args.claim_workers)
+    retriever.close()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline retrieval pipeline benchmark')
+    parser.add_argument('--fixtures', default=str(DEFAULT_FIXTURES), help='Fixture directory')
+    parser.add_argument('--seed', action='store_true', help='(Re)build fixtures from data/*.csv and exit')
+    parser.add_argument('--record', action='store_true',
+                      help='Run against live sites (and Gemini with --verify), recording fixtures')
+    parser.add_argument('--gemini-key', help='Gemini API key for --record --verify')
+    parser.add_argument('--verify', action='store_true', help='Include decomposition and verification')
+    parser.add_argument('-n', '--num-results', type=int, default=5)
+    parser.add_argument('--claim-workers', type=int, default=4)
+    parser.add_argument('-w', '--max-workers', type=int, default=8)
+    parser.add_argument('--parse-workers', type=int, default=0)
+    parser.add_argument('--async', dest='use_async', action='store_true')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated latency per HTTP request')
+    parser.add_argument('--gemini-latency-ms', type=float, default=0.0, help='Simulated latency per Gemini call')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs (default: 3)')
+    parser.add_argument('--trace-memory', action='store_true',
+                      help='Also report peak Python heap via tracemalloc (slows the run)')
+    parser.add_argument('-o', '--output', help='Write the report as JSON')
+    args = parser.parse_args()
+
+    store = FixtureStore(args.fixtures)
+    if args.seed:
+        seed_fixtures(store)
+        return
+    if not store.index["http"] and not args.record:
+        seed_fixtures(store)
+
+    claims = benchmark_claims(load_dataset())
+    if args.trace_memory:
+        tracemalloc.start()
+    walls = []
+    spans: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(1 if args.record else args.repeat):
+            timings_path = os.path.join(tmp, f"run{run}.jsonl")
+            walls.append(run_once(args, store, claims, timings_path))
+            with open(timings_path, encoding="utf-8") as f:
+                spans.extend(json.loads(line) for line in f)
+    if args.record:
+        store.save()
+        print(f"Recorded fixtures to {store.path}")
+
+    runs = len(walls)
+    fetches = [span for span in spans if span["stage"] == "fetch" and not span.get("error")]
+    wall = statistics.median(walls)
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key != "gemini_key"},
+        "claims": len(claims),
+        "runs": runs,
+        "wall_seconds": {"median": round(wall, 4), "min": round(min(walls), 4), "max": round(max(walls), 4)},
+        "claims_per_second": round(len(claims) / wall, 2),
+        "articles_per_second": round(len(fetches) / runs / wall, 2),
+        "download_mb_per_second": round(sum(span.get("bytes", 0) for span in fetches) / runs / wall / 1e6, 3),
+        "stages": stage_report(spans),
+        "memory": {"peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)},
+    }
+    if args.trace_memory:
+        report["memory"]["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+
+    print(f"\n{len(claims)} claims x {runs} runs: median {wall:.3f}s "
+          f"({report['claims_per_second']} claims/s, {report['articles_per_second']} articles/s)")
+    print(f"{'stage':<10}{'count':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for stage, row in report["stages"].items():
+        print(f"{stage:<10}{row['count']:>7}{row['mean_ms']:>10.2f}{row['p50_ms']:>10.2f}"
+              f"{row['p95_ms']:>10.2f}{row['max_ms']:>10.2f}")
+    print(f"Peak RSS: {report['memory']['peak_rss_mb']} MB")
+    if args.trace_memory:
+        print(f"Peak Python heap: {report['memory']['peak_traced_mb']} MB")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
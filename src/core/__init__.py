@@ -2,4 +2,9 @@
 Core functionality for source retrieval and verification.
 """
 
-from .source_retrieval import SourceRetriever, ArticleInfo
\ No newline at end of file
+from .source_retrieval import SourceRetriever, ArticleInfo, PipelineEvent
+from .async_retrieval import AsyncSourceRetriever
+from .search_backends import SearchBackend, DuckDuckGoBackend, LocalCorpusBackend, IndexBackend
+from .inverted_index import InvertedIndex
+from .metrics import MetricsRegistry, PipelineMetrics
+from .llm import LLMClient, LLMResponse, GeminiClient, FakeLLMClient
@@ -0,0 +1,401 @@
+"""
+asyncio front end to the retrieval pipeline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@lru_cache(maxsize=None)
+def _aiohttp():
+    """aiohttp, imported on first use, or None if it is not installed.
+
+    Without it HTTP falls back to the blocking session on worker threads.
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        return None
+    return aiohttp
+
+try:
+    from .batch import BatchJournal, batch_settings, summarize_claim
+    from .http_session import (
+        DownloadRejected, FetchResult, check_content_length, check_content_type, conditional_headers
+    )
+    from .source_retrieval import (
+        DUCKDUCKGO_URL, ArticleInfo, PipelineEvent, SourceRetriever,
+        decompose_prompt, events_to_dataframe, parse_article_html, verification_prompt
+    )
+    from .search_backends import DuckDuckGoBackend, SearchBackend
+    from .timing import StageTimer, span
+    from .url_utils import url_key
+except ImportError:  # Running as a script from src/core
+    from batch import BatchJournal, batch_settings, summarize_claim
+    from http_session import (
+        DownloadRejected, FetchResult, check_content_length, check_content_type, conditional_headers
+    )
+    from source_retrieval import (
+        DUCKDUCKGO_URL, ArticleInfo, PipelineEvent, SourceRetriever,
+        decompose_prompt, events_to_dataframe, parse_article_html, verification_prompt
+    )
+    from search_backends import DuckDuckGoBackend, SearchBackend
+    from timing import StageTimer, span
+    from url_utils import url_key
+
+
+class AsyncSourceRetriever:
+    """Async counterpart of SourceRetriever for interleaving many claims in one process.
+
+    Wraps a SourceRetriever and shares its caches, rate limiter, context
+    builder and Gemini model. Downloads use aiohttp when it is installed
+    and native_http is set (otherwise the retriever's session on
+    io_threads, e.g. a replay session), HTML parsing runs on
+    the retriever's process pool (or io_threads without one), cache I/O runs
+    on io_threads, and Gemini is called with
+    generate_content_async. max_in_flight caps concurrent downloads across
+    all claims (never above the scheduler's max_total); per-host rates and
+    caps and 429/503 backoff come from the retriever's scheduler. A
+    retriever passed in stays open on close(); its creator closes it.
+    """
+
+    def __init__(self, retriever: Optional[SourceRetriever] = None, max_in_flight: int = 64,
+                 io_threads: int = 8, native_http: bool = True):
+        self._owns_retriever = retriever is None
+        self.retriever = retriever or SourceRetriever()
+        self.max_in_flight = max_in_flight
+        self.native_http = native_http
+        self._executor = ThreadPoolExecutor(max_workers=io_threads)
+        # Event-loop bound state, recreated if used from a different loop
+        self._loop = None
+        self._http = None
+        self._fetch_slots = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._http = None
+            self._fetch_slots = asyncio.Semaphore(self._max_connections())
+            self._host_slots = {}
+
+    async def _run(self, fn, *args):
+        """Run a blocking call on the I/O thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+
+    def _max_connections(self) -> int:
+        return min(self.max_in_flight, self.retriever.scheduler.max_total)
+
+    def _native(self) -> bool:
+        return self.native_http and _aiohttp() is not None
+
+    def _get_http(self):
+        if self._http is None:
+            aiohttp = _aiohttp()
+            self._http = aiohttp.ClientSession(
+                headers=self.retriever.headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.retriever.download_deadline,
+                    sock_connect=self.retriever.connect_timeout,
+                    sock_read=self.retriever.timeout
+                ),
+                connector=aiohttp.TCPConnector(limit=self._max_connections(), limit_per_host=0)
+            )
+        return self._http
+
+    @asynccontextmanager
+    async def _fetch_slot(self, url: str):
+        """Async counterpart of HostScheduler.slot, drawing on the same per-host token buckets."""
+        self._bind_loop()
+        scheduler = self.retriever.scheduler
+        host = scheduler.host_of(url)
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(scheduler.max_concurrent(host))
+        async with self._host_slots[host]:
+            await asyncio.sleep(scheduler.limiter(host).reserve())
+            async with self._fetch_slots:
+                yield
+
+    async def search_articles_duckduckgo(self, query: str, num_results: int = 10) -> List[str]:
+        """Search for articles using DuckDuckGo."""
+        retriever = self.retriever
+        if not self._native():
+            return await self._run(retriever.search_articles_duckduckgo, query, num_results)
+        cached = await self._run(retriever.search_cache.get_results, query, num_results)
+        if cached is not None:
+            return cached
+        try:
+            async with self._fetch_slot(DUCKDUCKGO_URL):
+                async with self._get_http().get(DUCKDUCKGO_URL, params={"q": query}) as response:
+                    retriever._note_throttling(DUCKDUCKGO_URL, response.status, response.headers)
+                    # A throttle or error page has no results worth parsing
+                    response.raise_for_status()
+                    html = await response.read()
+            results = await self._run(retriever.parse_search_results, html, num_results)
+            # Empty pages are usually throttling, so don't remember them
+            if results:
+                await self._run(retriever.search_cache.set_results, query, num_results, results)
+            return results
+        except Exception as e:
+            print(f"Error during search: {e}")
+            return []
+
+    async def search(self, backend: SearchBackend, query: str, num_results: int = 10,
+                     timer: Optional[StageTimer] = None) -> List[str]:
+        """Query one backend, using the native async client for DuckDuckGo."""
+        with span(timer, "search", backend=backend.name, query=query) as search_span:
+            try:
+                if isinstance(backend, DuckDuckGoBackend):
+                    results = await self.search_articles_duckduckgo(query, num_results)
+                else:
+                    results = await self._run(backend.search, query, num_results)
+            except Exception as e:
+                # One failing backend or query must not sink the others
+                print(f"Error searching {backend.name}: {e}")
+                search_span["error"] = f"{type(e).__name__}: {e}"
+                results = []
+            search_span["results"] = len(results)
+        return results
+
+    async def search_many(self, queries: List[str], num_results: int = 10,
+                          timer: Optional[StageTimer] = None) -> List[str]:
+        """Run several searches concurrently on every backend and merge them into one ranked URL list."""
+        result_lists = await asyncio.gather(
+            *(self.search(backend, query, num_results, timer)
+              for query in queries for backend in self.retriever.search_backends)
+        )
+        return self.retriever._merge_ranked(list(result_lists))
+
+    async def fetch_html(self, url: str, cached: Optional[Dict[str, Any]] = None) -> FetchResult:
+        """Async form of SourceRetriever.fetch_html.
+
+        Applies the retriever's content-type filter and size cap and sends
+        conditional headers for cached records; the download deadline is the
+        client's total timeout.
+        """
+        if not self._native():
+            return await self._run(self.retriever.fetch_html, url, cached)
+        headers = conditional_headers(cached.get("etag"), cached.get("last_modified")) if cached else {}
+        max_bytes = self.retriever.max_download_bytes
+        async with self._fetch_slot(url):
+            try:
+                async with self._get_http().get(url, headers=headers) as response:
+                    if response.status == 304:
+                        return FetchResult(not_modified=True)
+                    self.retriever._note_throttling(url, response.status, response.headers)
+                    response.raise_for_status()
+                    check_content_type(response.headers.get('Content-Type'))
+                    check_content_length(response.headers.get('Content-Length'), max_bytes)
+                    body = bytearray()
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        body.extend(chunk)
+                        if len(body) > max_bytes:
+                            raise DownloadRejected(f"Response exceeded {max_bytes} bytes")
+                    return FetchResult(
+                        body=bytes(body),
+                        encoding=response.charset,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+            except asyncio.TimeoutError:
+                raise DownloadRejected(
+                    f"Download took longer than {self.retriever.download_deadline:.0f}s"
+                ) from None
+
+    async def parse_article(self, url: str, html: bytes, encoding: Optional[str] = None,
+                            claim: Optional[str] = None) -> ArticleInfo:
+        """Parse on the retriever's process pool if it has one, else on the I/O threads."""
+        retriever = self.retriever
+        executor = retriever._get_parse_pool() if retriever.parse_workers else self._executor
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, partial(parse_article_html, url, html, encoding, claim)
+        )
+
+    async def extract_article_info(self, url: str, claim: Optional[str] = None,
+                                   timer: Optional[StageTimer] = None) -> Optional[ArticleInfo]:
+        """Extract information from an article, recording spans like SourceRetriever.extract_article_info."""
+        retriever = self.retriever
+        cache_key = url_key(url) or url
+        stale = None
+        try:
+            with span(timer, "fetch", url=url) as fetch_span:
+                local = await self._run(retriever.backend_article, url, claim)
+                if local:
+                    fetch_span["source"] = "backend"
+                    return local
+                if retriever.article_cache:
+                    cached = await self._run(retriever.article_cache.get_article, cache_key)
+                    if cached:
+                        fetch_span["source"] = "cache"
+                        return ArticleInfo.from_cache(cached, claim)
+                    stale = await self._run(retriever.article_cache.get_stale_article, cache_key)
+                print(f"Processing: {url}")
+                fetched = await self.fetch_html(url, stale)
+                fetch_span["source"] = "revalidated" if fetched.not_modified else "network"
+                fetch_span["bytes"] = len(fetched.body or b"")
+            if fetched.not_modified:
+                await self._run(retriever.article_cache.mark_revalidated, cache_key)
+                return ArticleInfo.from_cache(stale, claim)
+            with span(timer, "parse", url=url):
+                article_info = await self.parse_article(url, fetched.body, fetched.encoding, claim)
+            if retriever.article_cache:
+                await self._run(retriever._store_article, cache_key, article_info, fetched, stale is not None)
+            if retriever.article_index is not None:
+                await self._run(retriever.article_index.add, article_info.to_cache())
+            return article_info
+        except Exception as e:
+            print(f"Error extracting content from {url}: {e}")
+            return None
+
+    async def _generate_json(self, prompt: str):
+        retriever = self.retriever
+        # The response cache may be SQLite, so look it up and fill it off the event loop
+        cache_key, raw_response = await self._run(retriever._cached_response, prompt)
+        if raw_response is not None:
+            return await self._run(retriever._parse_response, cache_key, raw_response, True)
+        started = time.perf_counter()
+        response = await retriever.llm.generate_async(prompt)
+        retriever._record_gemini_usage(prompt, response, time.perf_counter() - started)
+        if response.text is None:
+            return None, "No response generated"
+        return await self._run(retriever._parse_response, cache_key, response.text, False)
+
+    async def decompose_claim_with_gemini(self, claim: str):
+        if not self.retriever.llm:
+            print("Gemini API key not configured")
+            return None
+        try:
+            return await self._generate_json(decompose_prompt(claim))
+        except Exception as e:
+            print(f"Error during claim verification: {e}")
+            return None, str(e)
+
+    async def verify_claim_with_gemini(self, claim: str, context: str):
+        """Verify a claim using Gemini API with provided context."""
+        if not self.retriever.llm:
+            print("Gemini API key not configured")
+            return None
+        try:
+            return await self._generate_json(verification_prompt(claim, context))
+        except Exception as e:
+            print(f"Error during claim verification: {e}")
+            return None, str(e)
+
+    async def iter_search_and_process_articles(self, claim: str, num_results: int = 10,
+                                               verify: bool = False) -> AsyncIterator[PipelineEvent]:
+        """Async form of SourceRetriever.iter_search_and_process_articles."""
+        retriever = self.retriever
+        timer = StageTimer(claim)
+        claims = []
+        if verify and retriever.llm:
+            with span(timer, "decompose"):
+                output = await self.decompose_claim_with_gemini(claim)
+            if output[0] is not None:
+                claims = output[0]["search_queries"]
+
+        urls = await self.search_many([claim] + claims, num_results, timer)
+        yield PipelineEvent("search", queries=[claim] + claims, urls=urls)
+
+        async def extract(i: int, url: str):
+            return i, await self.extract_article_info(url, claim, timer)
+
+        tasks = [asyncio.ensure_future(extract(i, url)) for i, url in enumerate(urls)]
+        found = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                i, article_info = await next_done
+                if article_info:
+                    found[i] = article_info
+                    yield PipelineEvent("article", index=i, article=article_info)
+        finally:
+            # Abandon outstanding downloads if the consumer stops early
+            for task in tasks:
+                task.cancel()
+        duplicates = await self._run(retriever.collapse_duplicates, found)
+        if duplicates:
+            yield PipelineEvent("duplicates", duplicates=duplicates)
+
+        if verify and retriever.llm:
+            articles = [found[i] for i in sorted(found)]
+            with span(timer, "context", articles=len(articles)) as context_span:
+                context = await self._run(
+                    retriever.context_builder.build,
+                    [info for info in articles if info.content],
+                    [claim] + claims
+                )
+                context_span["chars"] = len(context)
+            with span(timer, "verify"):
+                verification_result, raw_response = await self.verify_claim_with_gemini(claim, context)
+            if verification_result:
+                print(f"\nClaim Verification Result for {claim!r}:")
+                print(json.dumps(verification_result, indent=2))
+            yield PipelineEvent("verification", verification=verification_result, raw_response=raw_response)
+        yield await self._run(retriever.timings_event, timer)
+
+    async def search_and_process_articles(self, claim: str, num_results: int = 10,
+                                          verify: bool = False) -> pd.DataFrame:
+        """Search and process articles relevant to a claim, optionally verify with Gemini."""
+        events = [event async for event in self.iter_search_and_process_articles(claim, num_results, verify)]
+        return events_to_dataframe(events)
+
+    async def run_batch(self, claims: List[str], num_results: int = 5, verify: bool = False,
+                        max_concurrent_claims: int = 100,
+                        journal: Optional[BatchJournal] = None) -> pd.DataFrame:
+        """Async form of batch.run_batch: interleave many claims on one event loop."""
+        import pandas as pd
+
+        if not claims:
+            return pd.DataFrame()
+        settings = batch_settings(self.retriever, num_results, verify)
+        done = await self._run(journal.completed, settings) if journal else {}
+        pending = [claim for claim in claims if claim not in done]
+        if done:
+            print(f"Resuming batch: {len(claims) - len(pending)} claims already completed")
+        claim_slots = asyncio.Semaphore(max(1, max_concurrent_claims))
+
+        async def process(claim: str) -> Dict[str, Any]:
+            async with claim_slots:
+                try:
+                    results_df = await self.search_and_process_articles(claim, num_results, verify)
+                    record = summarize_claim(claim, results_df, verify)
+                except Exception as e:
+                    print(f"Error processing claim {claim!r}: {e}")
+                    record = {'claim': claim, 'num_sources': 0, 'urls': [], 'titles': [], 'error': str(e)}
+            if journal:
+                await self._run(journal.append, record, settings)
+            return record
+
+        records = await asyncio.gather(*(process(claim) for claim in pending))
+        done.update(zip(pending, records))
+        return pd.DataFrame([done[claim] for claim in claims])
+
+    async def close(self):
+        """Close the HTTP client and worker threads, and the retriever if this object created it."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        self._executor.shutdown(wait=False)
+        if self._owns_retriever:
+            self.retriever.close()
+
+
+async def run_batch_async(retriever: SourceRetriever, claims: List[str], num_results: int = 5,
+                          verify: bool = False, max_concurrent_claims: int = 100,
+                          journal: Optional[BatchJournal] = None, native_http: bool = True) -> pd.DataFrame:
+    """Run a batch through an AsyncSourceRetriever wrapping retriever, which the caller still closes."""
+    async_retriever = AsyncSourceRetriever(retriever, native_http=native_http)
+    try:
+        return await async_retriever.run_batch(claims, num_results, verify, max_concurrent_claims, journal)
+    finally:
+        await async_retriever.close()
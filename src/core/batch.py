@@ -0,0 +1,187 @@
+"""
+Batch claim verification over a shared SourceRetriever.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def load_claims(path: str) -> List[str]:
+    """Read claims from a .csv (claim column), .jsonl (claim field or bare strings) or .txt file.
+
+    Repeated claims (e.g. one dataset row per source URL) are kept once, in
+    first-seen order.
+    """
+    path = Path(path)
+    claims = []
+    if path.suffix == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or 'claim' not in reader.fieldnames:
+                raise ValueError(f"{path} has no 'claim' column")
+            claims = [row['claim'] for row in reader]
+    elif path.suffix == '.jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    claims.append(record['claim'] if isinstance(record, dict) else record)
+    elif path.suffix == '.txt':
+        with open(path, encoding='utf-8') as f:
+            claims = [line for line in f]
+    else:
+        raise ValueError("Claims file must be .csv, .jsonl or .txt")
+
+    unique = []
+    seen = set()
+    for claim in claims:
+        claim = (claim or '').strip()
+        if claim and claim not in seen:
+            seen.add(claim)
+            unique.append(claim)
+    return unique
+
+
+def summarize_claim(claim: str, results_df: pd.DataFrame, verify: bool = False) -> Dict[str, Any]:
+    """One consolidated output record for a processed claim.
+
+    A requested verification that produced no verdict is recorded as an
+    error so resumed runs retry the claim.
+    """
+    verification = results_df.attrs.get('verification') or {}
+    has_rows = not results_df.empty
+    error = None
+    if verify and not verification:
+        error = results_df.attrs.get('raw_gemini_response') or 'Verification failed'
+    return {
+        'claim': claim,
+        'verdict': verification.get('verdict'),
+        'confidence': verification.get('confidence'),
+        'explanation': verification.get('explanation'),
+        'num_sources': len(results_df),
+        'urls': results_df['url'].tolist() if has_rows else [],
+        'titles': results_df['title'].tolist() if has_rows else [],
+        'error': error,
+    }
+
+
+def verify_one(retriever, claim: str, num_results: int, verify: bool) -> Dict[str, Any]:
+    """Process a single claim, recording failures instead of raising."""
+    try:
+        results_df = retriever.search_and_process_articles(claim, num_results, verify=verify)
+        return summarize_claim(claim, results_df, verify)
+    except Exception as e:
+        print(f"Error processing claim {claim!r}: {e}")
+        return {'claim': claim, 'num_sources': 0, 'urls': [], 'titles': [], 'error': str(e)}
+
+
+def batch_settings(retriever, num_results: int, verify: bool) -> Dict[str, Any]:
+    """Run settings a journaled result depends on; a claim is only resumed under the same settings.
+
+    Covers where sources come from (search backends, corpus and index) and,
+    when verifying, the model and the context given to it.
+    """
+    llm = getattr(retriever, 'llm', None)
+    context = getattr(retriever, 'context_builder', None) if verify and llm else None
+    return {
+        'num_results': num_results,
+        'verify': verify,
+        'search_backends': [backend.describe() for backend in getattr(retriever, 'search_backends', [])],
+        'model': llm.model_name if verify and llm else None,
+        'context_token_budget': context.token_budget if context else None,
+        'top_passages': context.top_k if context else None,
+    }
+
+
+class BatchJournal:
+    """Append-only JSON lines checkpoint of per-claim batch results.
+
+    Each finished claim is written and fsynced immediately, so a crashed run
+    loses at most the claims that were in flight. Records carry the run's
+    settings so a rerun with different settings does not reuse them.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Terminate a torn final line so the next record starts on its own line
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, 'rb+') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def completed(self, settings: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """Successfully finished claims, keyed by claim text (later entries win).
+
+        With settings, records written under other settings are ignored.
+        """
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a crash mid-write
+                    continue
+                record_settings = record.pop('settings', None)
+                if settings is not None and record_settings != settings:
+                    continue
+                if record.get('error'):
+                    records.pop(record['claim'], None)
+                else:
+                    records[record['claim']] = record
+        return records
+
+    def append(self, record: Dict[str, Any], settings: Optional[Dict[str, Any]] = None):
+        if settings is not None:
+            record = {**record, 'settings': settings}
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def run_batch(retriever, claims: List[str], num_results: int = 5, verify: bool = False,
+              max_concurrent_claims: int = 4, journal: Optional[BatchJournal] = None) -> pd.DataFrame:
+    """Process claims concurrently through one retriever, sharing its session, caches and limits.
+
+    With a journal, claims it already records as completed with the same
+    settings are skipped and each newly finished claim is checkpointed. Returns one row per claim, in
+    input order.
+    """
+    import pandas as pd
+
+    if not claims:
+        return pd.DataFrame()
+    settings = batch_settings(retriever, num_results, verify)
+    done = journal.completed(settings) if journal else {}
+    pending = [claim for claim in claims if claim not in done]
+    if done:
+        print(f"Resuming batch: {len(claims) - len(pending)} claims already completed")
+
+    def process(claim: str) -> Dict[str, Any]:
+        record = verify_one(retriever, claim, num_results, verify)
+        if journal:
+            journal.append(record, settings)
+        return record
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrent_claims, len(pending)))) as executor:
+            done.update(zip(pending, executor.map(process, pending)))
+    return pd.DataFrame([done[claim] for claim in claims])
@@ -0,0 +1,302 @@
+"""
+Persistent caches for the retrieval pipeline.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def content_key(*parts: str) -> str:
+    """Content address for a cache entry: SHA-256 over the given parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    """Casefold, NFKC-normalize and collapse whitespace so equivalent queries share a key."""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    query = re.sub(r"\s+", " ", query).strip()
+    return query.strip(" .?!")
+
+
+class MemoryCache:
+    """Thread-safe in-memory LRU cache with TTL expiry and hit/miss counters."""
+
+    def __init__(self, ttl: Optional[float] = 3600, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl is not None and time.time() - entry[1] > self.ttl):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, created_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (value, time.time() if created_at is None else created_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """SQLite-backed key/value store with TTL expiry and size-bounded LRU eviction.
+
+    Values are stored as zlib-compressed JSON. ttl is in seconds (None never
+    expires); max_entries and max_bytes bound the cache, evicting the least
+    recently used entries first. Expired entries are kept for a further
+    max_stale seconds so callers can revalidate them (see get_stale).
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 10000, max_bytes: int = 512 * 1024 * 1024,
+                 max_stale: float = 0.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Like get, but returns (value, created_at) so copies can keep the original expiry."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1]):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]).decode("utf-8")), row[1]
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """Return a value even if expired, as long as it is within the stale window."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if self.ttl is not None and time.time() - row[1] > self.ttl + self.max_stale:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def touch(self, key: str):
+        """Mark an entry fresh again, e.g. after the origin confirmed it is unchanged."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET created_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+            self._conn.commit()
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value and evict old entries if over budget."""
+        blob = zlib.compress(json.dumps(value, default=str).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop entries past their stale window, then least recently used ones until within budget."""
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl - self.max_stale,)
+            )
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+        stale = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+            "bytes": total,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ArticleCache(DiskCache):
+    """Parsed articles keyed by canonical URL.
+
+    Entries may carry the response's ETag/Last-Modified validators so expired
+    articles can be revalidated with a conditional GET instead of refetched.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 10000, max_bytes: int = 512 * 1024 * 1024,
+                 max_stale: float = 30 * 24 * 3600):
+        super().__init__(path, ttl, max_entries, max_bytes, max_stale)
+        self.revalidated = 0
+        self.refetched = 0
+
+    def get_article(self, url_key: str) -> Optional[Dict[str, Any]]:
+        return self.get(content_key(url_key))
+
+    def get_stale_article(self, url_key: str) -> Optional[Dict[str, Any]]:
+        """An expired article with validators, eligible for a conditional request."""
+        article = self.get_stale(content_key(url_key))
+        if article and (article.get("etag") or article.get("last_modified")):
+            return article
+        return None
+
+    def set_article(self, url_key: str, article: Dict[str, Any]):
+        self.set(content_key(url_key), article)
+
+    def mark_revalidated(self, url_key: str):
+        """Record a 304: the cached parse is current again."""
+        self.touch(content_key(url_key))
+        self.revalidated += 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["revalidated"] = self.revalidated
+        stats["refetched"] = self.refetched
+        return stats
+
+
+class SearchCache:
+    """Search results keyed on normalized query text and result count.
+
+    Lookups go to an in-memory LRU first and fall back to an optional SQLite
+    file, so results survive restarts when a path is given.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = 3600,
+                 max_entries: int = 1024):
+        self.memory = MemoryCache(ttl=ttl, max_entries=max_entries)
+        self.disk = DiskCache(path, ttl=ttl, max_entries=max_entries * 10) if path else None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, num_results: int) -> str:
+        return content_key(normalize_query(query), str(num_results))
+
+    def get_results(self, query: str, num_results: int) -> Optional[List[str]]:
+        key = self.key(query, num_results)
+        results = self.memory.get(key)
+        if results is None and self.disk:
+            entry = self.disk.get_entry(key)
+            if entry is not None:
+                # Keep the disk entry's age so the copy expires with it
+                results, created_at = entry
+                self.memory.set(key, results, created_at)
+        if results is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(results)
+
+    def set_results(self, query: str, num_results: int, results: List[str]):
+        key = self.key(query, num_results)
+        self.memory.set(key, list(results))
+        if self.disk:
+            self.disk.set(key, list(results))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self.memory.stats()["entries"],
+        }
+
+    def close(self):
+        if self.disk:
+            self.disk.close()
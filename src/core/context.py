@@ -0,0 +1,129 @@
+"""
+Token-budgeted assembly of the article context sent to Gemini.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+# Rough characters-per-token ratio for English text with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate that needs no tokenizer or API call."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+@dataclass
+class Passage:
+    text: str
+    article_index: int
+    passage_index: int
+    tokens: int
+    score: float = 0.0
+
+
+def split_passages(text: str, max_tokens: int = 200, min_words: int = 5) -> List[str]:
+    """Split article text into passages of at most roughly max_tokens.
+
+    Paragraphs are merged until the limit and over-long paragraphs are split
+    on sentence boundaries. Fragments shorter than min_words (menu items,
+    captions, share buttons) are dropped.
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n|\n", text or "")]
+    paragraphs = [p for p in paragraphs if len(p.split()) >= min_words]
+
+    pieces = []
+    for paragraph in paragraphs:
+        if estimate_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+        else:
+            pieces.extend(s for s in _SENTENCE_END.split(paragraph) if s)
+
+    passages = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current} {piece}".strip() if current else piece
+        if current and estimate_tokens(candidate) > max_tokens:
+            passages.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        passages.append(current)
+    # Single sentences longer than the limit are hard-truncated
+    limit = max_tokens * CHARS_PER_TOKEN
+    return [p[:limit] for p in passages]
+
+
+# scorer(queries, passages) -> one score per passage, higher is better
+PassageScorer = Callable[[Sequence[str], List[Passage]], List[float]]
+
+
+def positional_scores(queries: Sequence[str], passages: List[Passage]) -> List[float]:
+    """Default scoring: lead passages first, round-robin across articles in search rank order."""
+    num_articles = max((p.article_index for p in passages), default=0) + 1
+    return [-(p.passage_index * num_articles + p.article_index) for p in passages]
+
+
+class ContextBuilder:
+    """Pack the highest-scoring passages of a set of articles into a fixed token budget.
+
+    If top_k is set, at most that many passages are kept even when the
+    budget would allow more.
+    """
+
+    def __init__(self, token_budget: int = 8000, passage_tokens: int = 200,
+                 scorer: Optional[PassageScorer] = None, top_k: Optional[int] = None):
+        self.token_budget = token_budget
+        self.passage_tokens = passage_tokens
+        self.scorer = scorer or positional_scores
+        self.top_k = top_k
+
+    def select(self, articles: Sequence, queries: Sequence[str] = ()) -> List[Passage]:
+        """Choose passages within the budget, returned in article/passage order."""
+        passages = []
+        for article_index, article in enumerate(articles):
+            for passage_index, text in enumerate(split_passages(article.content, self.passage_tokens)):
+                passages.append(Passage(text, article_index, passage_index, estimate_tokens(text)))
+        if not passages:
+            return []
+
+        for passage, score in zip(passages, self.scorer(queries, passages)):
+            passage.score = score
+
+        # Each article's header is charged to the budget with its first selected passage
+        header_tokens = [estimate_tokens(self._header(i, article)) for i, article in enumerate(articles)]
+        selected = []
+        included = set()
+        used = 0
+        for passage in sorted(passages, key=lambda p: p.score, reverse=True):
+            if self.top_k is not None and len(selected) >= self.top_k:
+                break
+            cost = passage.tokens
+            if passage.article_index not in included:
+                cost += header_tokens[passage.article_index]
+            if used + cost > self.token_budget:
+                continue
+            selected.append(passage)
+            included.add(passage.article_index)
+            used += cost
+        return sorted(selected, key=lambda p: (p.article_index, p.passage_index))
+
+    @staticmethod
+    def _header(index: int, article) -> str:
+        return f"[Source {index + 1}: {article.title or article.source} ({article.url})]"
+
+    def build(self, articles: Sequence, queries: Sequence[str] = ()) -> str:
+        """Render the selected passages grouped under a header per source article."""
+        sections = []
+        current = None
+        for passage in self.select(articles, queries):
+            if passage.article_index != current:
+                current = passage.article_index
+                sections.append(self._header(current, articles[current]))
+            sections.append(passage.text)
+        return "\n\n".join(sections)
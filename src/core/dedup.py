@@ -0,0 +1,90 @@
+"""
+Near-duplicate detection for extracted articles (MinHash + LSH).
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Set
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+# Mersenne prime modulus for the universal hash family
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """32-bit hashes of the text's overlapping size-word shingles."""
+    words = _WORD.findall((text or "").lower())
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+class MinHasher:
+    """MinHash signatures: num_perm random hash functions of the form (a*x + b) mod p."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, _MAX_HASH, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MAX_HASH, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: Set[int]) -> np.ndarray:
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        # Operands are below 2**32, so a*x + b cannot overflow 64 bits
+        permuted = (np.outer(self._a, values) + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1)
+
+
+class NearDuplicateDetector:
+    """Online clustering of near-duplicate texts by estimated Jaccard similarity.
+
+    Signatures are split into bands; texts sharing any band are candidates,
+    confirmed when their signatures agree on at least threshold of the
+    hash functions. The first text of each cluster is its representative.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 32,
+                 shingle_size: int = 5):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._buckets: Dict[tuple, List[Hashable]] = defaultdict(list)
+
+    def _band_keys(self, signature: np.ndarray) -> List[tuple]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """Register a text; returns the key of the representative it duplicates, or None if new.
+
+        Texts too short to shingle are never treated as duplicates.
+        """
+        hashes = shingles(text, self.shingle_size)
+        if not hashes:
+            return None
+        signature = self.hasher.signature(hashes)
+        band_keys = self._band_keys(signature)
+        candidates = []
+        for band_key in band_keys:
+            for candidate in self._buckets.get(band_key, ()):
+                if candidate not in candidates:
+                    candidates.append(candidate)
+        for candidate in candidates:
+            if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                return candidate
+        self._signatures[key] = signature
+        for band_key in band_keys:
+            self._buckets[band_key].append(key)
+        return None
@@ -0,0 +1,120 @@
+"""
+Shared HTTP session used for both search requests and article downloads.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(headers: Optional[Dict[str, str]] = None, pool_connections: int = 16,
+                  pool_maxsize: int = 16, max_retries: int = 2,
+                  backoff_factor: float = 0.3) -> requests.Session:
+    """Create a keep-alive session with pooled connections and retry on transient errors.
+
+    pool_connections is the number of hosts kept in the pool and pool_maxsize
+    the number of connections kept open per host.
+
+    Throttling responses (429, 503) are not retried here: urllib3 would
+    sleep for the whole Retry-After while the caller holds its scheduler
+    slots. They are returned to the caller, which backs the host off in
+    the HostScheduler instead.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(500, 502, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+@dataclass
+class FetchResult:
+    """Outcome of an article download.
+
+    body is None when not_modified is set (the server answered 304 to a
+    conditional request). etag and last_modified are the response validators.
+    """
+    body: Optional[bytes] = None
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+def conditional_headers(etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for revalidating a cached response."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+# Content types worth handing to the article parser
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+
+class DownloadRejected(requests.RequestException):
+    """A response was refused before parsing (wrong content type, too large or too slow)."""
+
+
+def check_content_type(content_type: Optional[str]):
+    """Reject non-HTML responses (PDFs, images, video streams) before reading the body.
+
+    A missing Content-Type header is allowed since some servers omit it.
+    """
+    if not content_type:
+        return
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type not in HTML_CONTENT_TYPES:
+        raise DownloadRejected(f"Unsupported content type: {media_type}")
+
+
+def check_content_length(content_length: Optional[str], max_bytes: int):
+    """Reject responses whose declared size is already over the cap."""
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise DownloadRejected(f"Response too large: {content_length} bytes (limit {max_bytes})")
+
+
+def read_capped(response: requests.Response, max_bytes: int, deadline: Optional[float] = None,
+                chunk_size: int = 64 * 1024) -> bytes:
+    """Read a streamed response body, aborting once it exceeds max_bytes or runs past deadline seconds.
+
+    The read timeout only bounds the gap between chunks, so the deadline is
+    what stops a server that trickles bytes forever.
+    """
+    started = time.monotonic()
+    chunks = []
+    size = 0
+    raw = response.raw
+    # read1 returns whatever has arrived instead of waiting for a full chunk
+    if hasattr(raw, "read1"):
+        stream = iter(lambda: raw.read1(chunk_size, decode_content=True), b"")
+    else:
+        stream = response.iter_content(chunk_size)
+    for chunk in stream:
+        size += len(chunk)
+        if size > max_bytes:
+            raise DownloadRejected(f"Response exceeded {max_bytes} bytes")
+        if deadline is not None and time.monotonic() - started > deadline:
+            raise DownloadRejected(f"Download took longer than {deadline:.0f}s")
+        chunks.append(chunk)
+    return b"".join(chunks)
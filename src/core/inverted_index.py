@@ -0,0 +1,373 @@
+"""
+On-disk inverted index over extracted articles, queried with BM25.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .ranking import tokenize
+    from .url_utils import url_key
+except ImportError:  # Running as a script from src/core
+    from ranking import tokenize
+    from url_utils import url_key
+
+
+def encode_varint(value: int, out: bytearray):
+    """Append an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Read a varint at offset; returns (value, next offset)."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_posting(doc_gap: int, positions: List[int], out: bytearray):
+    """One posting: doc id gap, term frequency, then position gaps."""
+    encode_varint(doc_gap, out)
+    encode_varint(len(positions), out)
+    previous = 0
+    for position in positions:
+        encode_varint(position - previous, out)
+        previous = position
+
+
+def decode_postings(data: bytes) -> Iterator[Tuple[int, List[int]]]:
+    """Yield (doc_id, positions) from an uncompressed postings list."""
+    offset = 0
+    doc_id = 0
+    while offset < len(data):
+        gap, offset = decode_varint(data, offset)
+        doc_id += gap
+        tf, offset = decode_varint(data, offset)
+        positions = []
+        position = 0
+        for _ in range(tf):
+            step, offset = decode_varint(data, offset)
+            position += step
+            positions.append(position)
+        yield doc_id, positions
+
+
+def term_positions(text: str) -> Dict[str, List[int]]:
+    """Token positions per term, using the same tokenizer as passage ranking."""
+    positions: Dict[str, List[int]] = defaultdict(list)
+    for i, token in enumerate(tokenize(text)):
+        positions[token].append(i)
+    return positions
+
+
+class InvertedIndex:
+    """SQLite-backed positional inverted index with incremental adds and BM25 queries.
+
+    Postings are zlib-compressed blobs of varint doc-id gaps, term
+    frequencies and position gaps. New postings are buffered in memory and
+    written every flush_every documents as one new segment per term; a term
+    with more than max_segments segments is merged back into one, dropping
+    postings of replaced documents. Queries read the segments and the
+    buffer. Documents are keyed by canonical URL; re-adding a URL with
+    changed content replaces it.
+    """
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75,
+                 flush_every: int = 256, max_segments: int = 8):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self.flush_every = max(1, flush_every)
+        self.max_segments = max(1, max_segments)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "doc_id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, length INTEGER NOT NULL, "
+            "record BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        meta = dict(self._conn.execute("SELECT name, value FROM meta").fetchall())
+        if "indexed_through" not in meta:
+            # Index files from before segments kept one postings row per term;
+            # drop them and rebuild postings from the stored documents below
+            self._conn.execute("DROP TABLE IF EXISTS postings")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL)"
+        )
+        # last_doc orders a term's segments and bounds the doc ids inside them
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            "term TEXT NOT NULL, last_doc INTEGER NOT NULL, data BLOB NOT NULL, "
+            "PRIMARY KEY (term, last_doc))"
+        )
+        self._conn.commit()
+        # Document lengths kept in memory so queries only touch the postings they need
+        self._lengths: Dict[int, int] = dict(
+            self._conn.execute("SELECT doc_id, length FROM documents").fetchall()
+        )
+        self._total_length = sum(self._lengths.values())
+        # Doc ids are never reused: a replaced document's stale postings must not
+        # be attributed to whatever is added next
+        max_doc = max(self._lengths, default=0)
+        max_posted = self._conn.execute("SELECT COALESCE(MAX(last_doc), 0) FROM segments").fetchone()[0]
+        self._next_doc_id = max(meta.get("next_doc_id", 1), max_doc + 1, max_posted + 1)
+        # Postings not yet written to segments: per term, encoded postings and their last doc id
+        self._buffer: Dict[str, bytearray] = {}
+        self._buffer_last: Dict[str, int] = {}
+        self._df_delta: Dict[str, int] = defaultdict(int)
+        self._buffered_docs = 0
+        # Every document up to this id has its postings in segments
+        self._indexed_through = meta.get("indexed_through", 0)
+        with self._lock:
+            # Documents stored before an unclean shutdown lost their buffered postings
+            for doc_id, blob in self._conn.execute(
+                "SELECT doc_id, record FROM documents WHERE doc_id > ? ORDER BY doc_id",
+                (self._indexed_through,)
+            ).fetchall():
+                self._buffer_postings(doc_id, term_positions(self._text(json.loads(zlib.decompress(blob)))))
+            self._flush()
+
+    @staticmethod
+    def _text(record: Dict[str, Any]) -> str:
+        return f"{record.get('title') or ''}\n{record.get('content') or ''}"
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Index an article record (ArticleInfo.to_cache form).
+
+        Returns False if the URL is already indexed with the same content.
+        """
+        key = url_key(record.get("url") or "")
+        if not key or not record.get("content"):
+            return False
+        text = self._text(record)
+        positions = term_positions(text)
+        blob = zlib.compress(json.dumps(record, default=str).encode("utf-8"))
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT doc_id, record FROM documents WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                if self._text(json.loads(zlib.decompress(row[1]))) == text:
+                    return False
+                self._remove(row[0], row[1])
+            length = sum(len(term_pos) for term_pos in positions.values())
+            doc_id = self._next_doc_id
+            self._next_doc_id += 1
+            self._conn.execute(
+                "INSERT INTO documents (doc_id, key, length, record) VALUES (?, ?, ?, ?)",
+                (doc_id, key, length, blob)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('next_doc_id', ?)", (self._next_doc_id,)
+            )
+            self._conn.commit()
+            self._lengths[doc_id] = length
+            self._total_length += length
+            self._buffer_postings(doc_id, positions)
+            if self._buffered_docs >= self.flush_every:
+                self._flush()
+        return True
+
+    def _buffer_postings(self, doc_id: int, positions: Dict[str, List[int]]):
+        for term, term_pos in positions.items():
+            last_doc = self._buffer_last.get(term, 0)
+            # Doc ids only grow, so new postings append to the end of the list
+            if doc_id <= max(last_doc, self._indexed_through):
+                raise ValueError(f"Posting for doc {doc_id} would not follow existing postings of {term!r}")
+            encode_posting(doc_id - last_doc, term_pos, self._buffer.setdefault(term, bytearray()))
+            self._buffer_last[term] = doc_id
+            self._df_delta[term] += 1
+        self._buffered_docs += 1
+
+    def _remove(self, doc_id: int, blob: bytes):
+        """Drop a document; its stale postings are skipped at query time and purged on merge."""
+        for term in term_positions(self._text(json.loads(zlib.decompress(blob)))):
+            self._df_delta[term] -= 1
+        self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+        self._total_length -= self._lengths.pop(doc_id, 0)
+
+    def flush(self):
+        """Write buffered postings to disk."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer and not self._df_delta:
+            return
+        self._conn.executemany(
+            "INSERT INTO segments (term, last_doc, data) VALUES (?, ?, ?)",
+            [(term, self._buffer_last[term], zlib.compress(bytes(data))) for term, data in self._buffer.items()]
+        )
+        self._conn.executemany(
+            "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+            [(term, delta) for term, delta in self._df_delta.items() if delta]
+        )
+        self._indexed_through = self._next_doc_id - 1
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('indexed_through', ?)", (self._indexed_through,)
+        )
+        flushed = list(self._buffer)
+        self._buffer.clear()
+        self._buffer_last.clear()
+        self._df_delta.clear()
+        self._buffered_docs = 0
+        for i in range(0, len(flushed), 500):
+            chunk = flushed[i:i + 500]
+            for (term,) in self._conn.execute(
+                f"SELECT term FROM segments WHERE term IN ({','.join('?' * len(chunk))}) "
+                "GROUP BY term HAVING COUNT(*) > ?", chunk + [self.max_segments]
+            ).fetchall():
+                self._merge(term)
+        self._conn.commit()
+
+    def _merge(self, term: str):
+        """Rewrite a term's segments as one, keeping only postings of current documents."""
+        rows = self._conn.execute(
+            "SELECT last_doc, data FROM segments WHERE term = ? ORDER BY last_doc", (term,)
+        ).fetchall()
+        data = bytearray()
+        previous = 0
+        df = 0
+        for _, blob in rows:
+            for doc_id, positions in decode_postings(zlib.decompress(blob)):
+                if doc_id in self._lengths:
+                    encode_posting(doc_id - previous, positions, data)
+                    previous = doc_id
+                    df += 1
+        self._conn.execute("DELETE FROM segments WHERE term = ?", (term,))
+        if df:
+            self._conn.execute(
+                "INSERT INTO segments (term, last_doc, data) VALUES (?, ?, ?)",
+                (term, rows[-1][0], zlib.compress(bytes(data)))
+            )
+            self._conn.execute("UPDATE terms SET df = ? WHERE term = ?", (df, term))
+        else:
+            self._conn.execute("DELETE FROM terms WHERE term = ?", (term,))
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def search(self, query: str, num_results: int = 10, phrase: bool = False) -> List[Tuple[str, float]]:
+        """Top documents for a query as (url, BM25 score) pairs, best first.
+
+        With phrase set, only documents containing the query terms
+        consecutively (after stopword removal) are returned.
+        """
+        query_terms = tokenize(query)
+        if not query_terms:
+            return []
+        unique_terms = list(dict.fromkeys(query_terms))
+        placeholders = ','.join('?' * len(unique_terms))
+        with self._lock:
+            n = len(self._lengths)
+            if not n:
+                return []
+            avg_length = self._total_length / n
+            dfs = dict(self._conn.execute(
+                f"SELECT term, df FROM terms WHERE term IN ({placeholders})", unique_terms
+            ).fetchall())
+            blobs: Dict[str, List[bytes]] = defaultdict(list)
+            for term, data in self._conn.execute(
+                f"SELECT term, data FROM segments WHERE term IN ({placeholders}) ORDER BY term, last_doc",
+                unique_terms
+            ).fetchall():
+                blobs[term].append(zlib.decompress(data))
+            for term in unique_terms:
+                dfs[term] = dfs.get(term, 0) + self._df_delta.get(term, 0)
+                if term in self._buffer:
+                    blobs[term].append(bytes(self._buffer[term]))
+            # Scored and resolved to URLs under the lock, so a concurrent add
+            # cannot replace a document between ranking and lookup
+            scores = self._score(blobs, dfs, n, avg_length, query_terms, phrase)
+            results = []
+            for doc_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+                url = self._url(doc_id)
+                if url is None:
+                    continue
+                results.append((url, score))
+                if len(results) == num_results:
+                    break
+        return results
+
+    def _score(self, blobs: Dict[str, List[bytes]], dfs: Dict[str, int], n: int, avg_length: float,
+               query_terms: List[str], phrase: bool) -> Dict[int, float]:
+        """BM25 score per current document; caller holds the lock."""
+        lengths = self._lengths
+        scores: Dict[int, float] = defaultdict(float)
+        positions: Dict[str, Dict[int, List[int]]] = {}
+        for term, term_blobs in blobs.items():
+            df = max(dfs[term], 1)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            term_docs = {}
+            for data in term_blobs:
+                for doc_id, doc_positions in decode_postings(data):
+                    length = lengths.get(doc_id)
+                    if length is None:  # replaced document
+                        continue
+                    tf = len(doc_positions)
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+                    term_docs[doc_id] = doc_positions
+            positions[term] = term_docs
+        if phrase:
+            scores = {
+                doc_id: score for doc_id, score in scores.items()
+                if self._has_phrase(doc_id, query_terms, positions)
+            }
+        return scores
+
+    @staticmethod
+    def _has_phrase(doc_id: int, terms: List[str], positions: Dict[str, Dict[int, List[int]]]) -> bool:
+        starts = set(positions.get(terms[0], {}).get(doc_id, []))
+        for offset, term in enumerate(terms[1:], 1):
+            following = set(positions.get(term, {}).get(doc_id, []))
+            starts = {start for start in starts if start + offset in following}
+        return bool(starts)
+
+    def _url(self, doc_id: int) -> Optional[str]:
+        """URL of a stored document, or None if it has been replaced; caller holds the lock."""
+        row = self._conn.execute("SELECT record FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))["url"] if row else None
+
+    def get_article(self, url: str) -> Optional[Dict[str, Any]]:
+        """Stored record for a URL, if indexed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM documents WHERE key = ?", (url_key(url) or url,)
+            ).fetchone()
+        return json.loads(zlib.decompress(row[0]).decode("utf-8")) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            terms = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+            segments, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM segments"
+            ).fetchone()
+            buffered = self._buffered_docs
+        return {"documents": len(self._lengths), "terms": terms, "segments": segments,
+                "postings_bytes": size, "buffered_documents": buffered}
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
@@ -0,0 +1,175 @@
+"""
+Pluggable LLM clients for claim decomposition and verification.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .context import estimate_tokens
+except ImportError:  # Running as a script from src/core
+    from context import estimate_tokens
+
+
+@dataclass
+class LLMResponse:
+    # None when the model returned no candidates (e.g. a blocked prompt)
+    text: Optional[str]
+    # Token counts reported by the model, if any
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+
+# The "Claim: ..." line of the decomposition and verification prompts
+_CLAIM_LINE = re.compile(r"^\s*Claim: (.*)$", re.MULTILINE)
+
+
+class LLMClient(ABC):
+    """Text-in, text-out model used by SourceRetriever's Gemini stages."""
+
+    # Part of the response cache key, so replies from different models never mix
+    model_name = "llm"
+
+    @abstractmethod
+    def generate(self, prompt: str) -> LLMResponse:
+        """Complete prompt, blocking until the reply is available."""
+
+    async def generate_async(self, prompt: str) -> LLMResponse:
+        """Non-blocking generate; runs generate on a worker thread unless overridden."""
+        return await asyncio.to_thread(self.generate, prompt)
+
+    def close(self):
+        pass
+
+
+class GeminiClient(LLMClient):
+    """Google Gemini through google.generativeai (imported on construction)."""
+
+    def __init__(self, api_key: str, model_name: str = "gemini-pro"):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    @staticmethod
+    def _to_response(response) -> LLMResponse:
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text=response.text if response.parts else None,
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            output_tokens=getattr(usage, "candidates_token_count", None),
+        )
+
+    def generate(self, prompt: str) -> LLMResponse:
+        return self._to_response(self.model.generate_content(prompt))
+
+    async def generate_async(self, prompt: str) -> LLMResponse:
+        return self._to_response(await self.model.generate_content_async(prompt))
+
+
+def canned_response(prompt: str) -> str:
+    """Deterministic reply for any pipeline prompt: no sub-queries, or an undecided verdict.
+
+    Verdicts follow the verification prompt's JSON schema, so batch output
+    has the same fields and types as real Gemini replies.
+    """
+    if '"search_queries"' in prompt:
+        return json.dumps({"search_queries": []})
+    claim = _CLAIM_LINE.search(prompt)
+    return json.dumps({
+        "claim": claim.group(1).strip() if claim else "",
+        "verdict": "INSUFFICIENT EVIDENCE",
+        "confidence": "LOW",
+        "explanation": "Canned reply: no model analyzed this claim.",
+        "supporting_evidence": [],
+        "contrary_evidence": [],
+        "limitations": ["Canned reply from a stand-in model; the evidence was not analyzed."],
+    })
+
+
+class FakeLLMClient(LLMClient):
+    """Local stand-in for Gemini, for load-testing the verification stage without quota or network.
+
+    Each call waits latency seconds (plus up to jitter more, and output
+    tokens / tokens_per_second when set) and answers with responder(prompt).
+    A failure_rate fraction of calls raise instead, like quota errors.
+    Calls, estimated tokens and peak concurrency are counted; see stats().
+    """
+
+    model_name = "fake"
+
+    def __init__(self, responder: Callable[[str], str] = canned_response, latency: float = 0.0,
+                 jitter: float = 0.0, tokens_per_second: Optional[float] = None,
+                 failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.responder = responder
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _start(self, prompt: str):
+        """Account for a new call; returns its reply (or None to fail) and how long to wait."""
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            fail = self._random.random() < self.failure_rate
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        try:
+            text = None if fail else self.responder(prompt)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        if text is not None and self.tokens_per_second:
+            delay += estimate_tokens(text) / self.tokens_per_second
+        return text, delay
+
+    def _finish(self, prompt: str, text: Optional[str]) -> LLMResponse:
+        with self._lock:
+            self.in_flight -= 1
+            if text is None:
+                self.failures += 1
+                raise RuntimeError("Simulated LLM failure")
+            response = LLMResponse(text, estimate_tokens(prompt), estimate_tokens(text))
+            self.prompt_tokens += response.prompt_tokens
+            self.output_tokens += response.output_tokens
+        return response
+
+    def generate(self, prompt: str) -> LLMResponse:
+        text, delay = self._start(prompt)
+        if delay:
+            time.sleep(delay)
+        return self._finish(prompt, text)
+
+    async def generate_async(self, prompt: str) -> LLMResponse:
+        text, delay = self._start(prompt)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._finish(prompt, text)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+                "peak_in_flight": self.peak_in_flight,
+            }
@@ -0,0 +1,74 @@
+"""
+Offline lexical relevance ranking (Okapi BM25).
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Sequence
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers herself him himself his how i if in into is it its itself
+just me more most my myself no nor not now of off on once only or other our ours ourselves out
+over own same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which
+while who whom why will with would you your yours yourself yourselves said says also
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords and possessive suffixes removed."""
+    tokens = []
+    for token in _TOKEN.findall((text or "").lower()):
+        if token.endswith("'s"):
+            token = token[:-2]
+        if token and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class BM25:
+    """BM25 over an in-memory list of documents."""
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_terms = [Counter(tokenize(doc)) for doc in documents]
+        self.doc_lengths = [sum(terms.values()) for terms in self.doc_terms]
+        self.avg_length = sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+        document_frequency: Dict[str, int] = Counter()
+        for terms in self.doc_terms:
+            document_frequency.update(terms.keys())
+        n = len(self.doc_terms)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def score(self, query: str) -> List[float]:
+        """BM25 score of every document against the query."""
+        query_terms = set(tokenize(query))
+        scores = []
+        for terms, length in zip(self.doc_terms, self.doc_lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            total = 0.0
+            for term in query_terms:
+                tf = terms.get(term)
+                if tf:
+                    total += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(total)
+        return scores
+
+
+def bm25_passage_scores(queries: Sequence[str], passages: List) -> List[float]:
+    """Passage scorer for ContextBuilder: BM25 summed over the claim and its sub-queries."""
+    index = BM25([passage.text for passage in passages])
+    totals = [0.0] * len(passages)
+    for query in queries:
+        for i, score in enumerate(index.score(query)):
+            totals[i] += score
+    return totals
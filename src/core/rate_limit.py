@@ -0,0 +1,115 @@
+"""
+Rate limiting primitives shared by the retrieval pipeline.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class RateLimiter:
+    """Thread-safe token bucket. acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it (0 if available now).
+
+        Tokens may be borrowed ahead of the refill, which queues callers in
+        arrival order; async callers sleep on the returned delay themselves.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """Take one token, sleeping until the bucket refills if necessary."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """Push the next available token back, e.g. after a 429 with Retry-After."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class HostScheduler:
+    """Politeness scheduler: a token bucket and a concurrency cap per host, plus a global cap.
+
+    slot() blocks until the request may proceed, so callers queue instead of
+    failing when a host is busy. host_limits overrides (rate, burst,
+    max_concurrent) for specific hosts (or URLs), e.g. the search endpoint.
+    """
+
+    def __init__(self, rate_per_host: float = 1.0, burst_per_host: int = 2, max_per_host: int = 2,
+                 max_total: int = 16, host_limits: Optional[Dict[str, Tuple[float, int, int]]] = None):
+        self.rate_per_host = rate_per_host
+        self.burst_per_host = burst_per_host
+        self.max_per_host = max(1, max_per_host)
+        self.max_total = max(1, max_total)
+        self.host_limits = {self.host_of(host): limits for host, limits in (host_limits or {}).items()}
+        self._global = threading.BoundedSemaphore(self.max_total)
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Host key for a URL (or bare host), without port or leading 'www.'."""
+        host = (urlparse(url).hostname if "//" in url else url) or url
+        host = host.lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _limits(self, host: str) -> Tuple[float, int, int]:
+        return self.host_limits.get(host, (self.rate_per_host, self.burst_per_host, self.max_per_host))
+
+    def limiter(self, url: str) -> RateLimiter:
+        """Token bucket for a URL's host."""
+        host = self.host_of(url)
+        with self._lock:
+            if host not in self._limiters:
+                rate, burst, _ = self._limits(host)
+                self._limiters[host] = RateLimiter(rate, burst)
+            return self._limiters[host]
+
+    def max_concurrent(self, url: str) -> int:
+        return max(1, self._limits(self.host_of(url))[2])
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrent(host))
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """Wait for a host slot, then a rate token, then a global slot."""
+        host = self.host_of(url)
+        with self._semaphore(host):
+            # Rate waits happen before taking a global slot so other hosts keep flowing
+            self.limiter(host).acquire()
+            with self._global:
+                yield
+
+    def backoff(self, url: str, seconds: float):
+        """Delay further requests to a URL's host (e.g. honouring Retry-After)."""
+        self.limiter(url).penalize(seconds)
@@ -0,0 +1,212 @@
+"""
+Record and replay HTTP traffic and Gemini responses, for offline benchmarks.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.response import HTTPResponse
+
+try:
+    from .http_session import build_session
+    from .llm import LLMClient, LLMResponse, canned_response
+except ImportError:  # Running as a script from src/core
+    from http_session import build_session
+    from llm import LLMClient, LLMResponse, canned_response
+
+# Response headers that describe the wire encoding rather than the stored body
+_WIRE_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+
+class FixtureStore:
+    """Directory of recorded responses: index.json plus one file per response body.
+
+    HTTP responses are keyed by their fully prepared request URL (query
+    included) and Gemini replies by the SHA-256 of the prompt.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # Bodies are read from disk once, keeping file I/O out of timed runs
+        self._bodies: Dict[str, bytes] = {}
+        index_path = self.path / "index.json"
+        if index_path.exists():
+            self.index = json.loads(index_path.read_text(encoding="utf-8"))
+        else:
+            self.index = {"http": {}, "gemini": {}}
+
+    @staticmethod
+    def http_key(url: str) -> str:
+        return requests.Request("GET", url).prepare().url
+
+    @staticmethod
+    def prompt_key(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def get_http(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        entry = self.index["http"].get(self.http_key(url))
+        if entry is None:
+            return None
+        body = self._bodies.get(entry["body"])
+        if body is None:
+            body = self._bodies[entry["body"]] = (self.path / entry["body"]).read_bytes()
+        return entry["status"], entry["headers"], body
+
+    def put_http(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = Path("bodies") / f"{digest}.bin"
+        with self._lock:
+            (self.path / "bodies").mkdir(parents=True, exist_ok=True)
+            (self.path / body_path).write_bytes(body)
+            self.index["http"][self.http_key(url)] = {
+                "status": status,
+                "headers": {k: v for k, v in headers.items() if k.lower() not in _WIRE_HEADERS},
+                "body": str(body_path),
+            }
+
+    def get_gemini(self, prompt: str) -> Optional[str]:
+        return self.index["gemini"].get(self.prompt_key(prompt))
+
+    def put_gemini(self, prompt: str, text: str):
+        with self._lock:
+            self.index["gemini"][self.prompt_key(prompt)] = text
+
+    def save(self):
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            (self.path / "index.json").write_text(json.dumps(self.index, indent=1), encoding="utf-8")
+
+
+def _build_response(adapter: HTTPAdapter, request: requests.PreparedRequest, status: int,
+                    headers: Dict[str, str], body: bytes) -> requests.Response:
+    """A requests Response backed by an in-memory body, as if read off the wire."""
+    headers = dict(headers)
+    headers["Content-Length"] = str(len(body))
+    raw = HTTPResponse(
+        body=io.BytesIO(body), headers=headers, status=status,
+        preload_content=False, decode_content=False, request_url=request.url
+    )
+    return adapter.build_response(request, raw)
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter answering every request from a FixtureStore.
+
+    Unrecorded URLs get a 404. Conditional requests matching a recorded
+    ETag get a 304. latency seconds are slept per request to model the network.
+    """
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0):
+        super().__init__()
+        self.store = store
+        self.latency = latency
+        self._builder = HTTPAdapter()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.store.get_http(request.url)
+        if recorded is None:
+            return _build_response(self._builder, request, 404, {"Content-Type": "text/html"}, b"")
+        status, headers, body = recorded
+        etag = headers.get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            return _build_response(self._builder, request, 304, {"ETag": etag}, b"")
+        return _build_response(self._builder, request, status, headers, body)
+
+    def close(self):
+        self._builder.close()
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that performs real requests and saves each response to a FixtureStore."""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        response = super().send(request, stream=True, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        body = response.content
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _WIRE_HEADERS}
+        if response.status_code != 304:
+            self.store.put_http(request.url, response.status_code, headers, body)
+        return _build_response(self, request, response.status_code, headers, body)
+
+
+def replay_session(store: FixtureStore, latency: float = 0.0,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """Session whose requests are all served from recorded fixtures."""
+    session = build_session(headers or {"User-Agent": "Mozilla/5.0"})
+    adapter = ReplayAdapter(store, latency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def recording_session(store: FixtureStore, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """Session that records every live response into store (call store.save() afterwards)."""
+    session = build_session(headers or {"User-Agent": "Mozilla/5.0"})
+    adapter = RecordingAdapter(store)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class ReplayModel(LLMClient):
+    """LLM client answering Gemini prompts from a FixtureStore.
+
+    Prompts without a recording are answered by fallback. latency seconds are
+    waited per call.
+    """
+
+    model_name = "replay"
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0,
+                 fallback: Callable[[str], str] = canned_response):
+        self.store = store
+        self.latency = latency
+        self.fallback = fallback
+
+    def _reply(self, prompt: str) -> LLMResponse:
+        text = self.store.get_gemini(prompt)
+        return LLMResponse(text if text is not None else self.fallback(prompt))
+
+    def generate(self, prompt: str) -> LLMResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._reply(prompt)
+
+    async def generate_async(self, prompt: str) -> LLMResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._reply(prompt)
+
+
+class RecordingModel(LLMClient):
+    """Wraps a real LLM client, saving each reply to a FixtureStore."""
+
+    def __init__(self, client: LLMClient, store: FixtureStore):
+        self.client = client
+        self.store = store
+        self.model_name = client.model_name
+
+    def _record(self, prompt: str, response: LLMResponse) -> LLMResponse:
+        if response.text is not None:
+            self.store.put_gemini(prompt, response.text)
+        return response
+
+    def generate(self, prompt: str) -> LLMResponse:
+        return self._record(prompt, self.client.generate(prompt))
+
+    async def generate_async(self, prompt: str) -> LLMResponse:
+        return self._record(prompt, await self.client.generate_async(prompt))
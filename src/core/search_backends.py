@@ -0,0 +1,136 @@
+"""
+Pluggable search backends for SourceRetriever.
+"""
+
+import csv
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+try:
+    from .inverted_index import InvertedIndex
+    from .ranking import BM25
+    from .url_utils import url_key
+except ImportError:  # Running as a script from src/core
+    from inverted_index import InvertedIndex
+    from ranking import BM25
+    from url_utils import url_key
+
+# Article bodies in the corpus CSVs exceed the csv module's default field limit
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+class SearchBackend(ABC):
+    """Source of candidate article URLs for a query."""
+
+    name = "backend"
+
+    @abstractmethod
+    def search(self, query: str, num_results: int = 10) -> List[str]:
+        """Return up to num_results article URLs, best first."""
+
+    def get_article(self, url: str) -> Optional[Dict[str, Any]]:
+        """Stored article for a URL, in ArticleInfo.to_cache form, if this backend holds one.
+
+        Backends that own their documents can serve them without a download.
+        """
+        return None
+
+    def describe(self) -> str:
+        """Which backend and data this is, for telling apart runs (e.g. batch journal settings)."""
+        return self.name
+
+    def close(self):
+        pass
+
+
+class DuckDuckGoBackend(SearchBackend):
+    """Live web search through a SourceRetriever's DuckDuckGo client (cached and rate limited)."""
+
+    name = "duckduckgo"
+
+    def __init__(self, retriever):
+        self.retriever = retriever
+
+    def search(self, query: str, num_results: int = 10) -> List[str]:
+        return self.retriever.search_articles_duckduckgo(query, num_results)
+
+
+class LocalCorpusBackend(SearchBackend):
+    """Offline backend ranking a local article corpus with BM25.
+
+    Deterministic and network-free; articles it returns are served from the
+    corpus rather than downloaded.
+    """
+
+    name = "local"
+
+    def __init__(self, documents: Sequence[Dict[str, Any]], source: Optional[str] = None):
+        # Where the documents were loaded from, if anywhere
+        self.source = source
+        self.documents: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        for document in documents:
+            url = (document.get("url") or "").strip()
+            key = url_key(url)
+            if not key or key in self._by_key or not document.get("content"):
+                continue
+            record = {
+                "url": url,
+                "title": document.get("title"),
+                "content": document["content"],
+                "source": urlparse(url).netloc,
+            }
+            self._by_key[key] = record
+            self.documents.append(record)
+        self._index = BM25([f"{doc['title'] or ''}\n{doc['content']}" for doc in self.documents])
+
+    @classmethod
+    def from_csv(cls, paths: Sequence[str]) -> 'LocalCorpusBackend':
+        """Load rows with url and content columns (e.g. data/*.csv; claim and title are optional)."""
+        documents = []
+        for path in paths:
+            with open(path, newline="", encoding="utf-8") as f:
+                documents.extend(csv.DictReader(f))
+        return cls(documents, ",".join(str(Path(path).resolve()) for path in paths))
+
+    @classmethod
+    def from_directory(cls, directory: Optional[str] = None) -> 'LocalCorpusBackend':
+        """Load every CSV in a directory, defaulting to the repository's data/ folder."""
+        directory = Path(directory) if directory else DEFAULT_CORPUS_DIR
+        return cls.from_csv(sorted(str(path) for path in directory.glob("*.csv")))
+
+    def search(self, query: str, num_results: int = 10) -> List[str]:
+        scores = self._index.score(query)
+        ranked = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+        return [self.documents[i]["url"] for i in ranked[:num_results] if scores[i] > 0]
+
+    def describe(self) -> str:
+        return f"{self.name}:{self.source or len(self.documents)}"
+
+    def get_article(self, url: str) -> Optional[Dict[str, Any]]:
+        return self._by_key.get(url_key(url) or url)
+
+
+class IndexBackend(SearchBackend):
+    """Searches previously extracted articles in an on-disk InvertedIndex.
+
+    Only supplies search hits: the indexed copy of an article is never
+    served, so hits go through the article cache (with its TTL and
+    revalidation) or are downloaded like any other URL.
+    """
+
+    name = "index"
+
+    def __init__(self, index: InvertedIndex):
+        self.index = index
+
+    def search(self, query: str, num_results: int = 10) -> List[str]:
+        return [url for url, _ in self.index.search(query, num_results)]
+
+    def describe(self) -> str:
+        return f"{self.name}:{self.index.path.resolve()}"
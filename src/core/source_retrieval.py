@@ -1,16 +1,60 @@
+from __future__ import annotations
+
 import requests
-from newspaper import Article
-import pandas as pd
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse, parse_qs, unquote
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Iterable, Iterator, Mapping, Tuple
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+import multiprocessing
+import threading
+import time
 
 import argparse
+import asyncio
 import json
 from pathlib import Path
-import google.generativeai as genai
+
+# newspaper, pandas, bs4, numpy and google.generativeai are imported where
+# they are first needed, keeping them out of the CLI and app start-up path
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .dedup import NearDuplicateDetector
+
+try:
+    from .batch import BatchJournal, load_claims, run_batch
+    from .cache import ArticleCache, DiskCache, MemoryCache, SearchCache, content_key
+    from .context import ContextBuilder, estimate_tokens
+    from .ranking import bm25_passage_scores
+    from .http_session import (
+        FetchResult, build_session, check_content_length, check_content_type,
+        conditional_headers, read_capped
+    )
+    from .rate_limit import HostScheduler
+    from .inverted_index import InvertedIndex
+    from .llm import FakeLLMClient, GeminiClient, LLMClient, LLMResponse
+    from .metrics import PipelineMetrics, start_http_server
+    from .search_backends import DuckDuckGoBackend, IndexBackend, LocalCorpusBackend, SearchBackend
+    from .timing import SpanLog, StageTimer, span, summarize_spans
+    from .url_utils import dedupe_urls, url_key
+except ImportError:  # Running as a script from src/core
+    from batch import BatchJournal, load_claims, run_batch
+    from cache import ArticleCache, DiskCache, MemoryCache, SearchCache, content_key
+    from context import ContextBuilder, estimate_tokens
+    from ranking import bm25_passage_scores
+    from http_session import (
+        FetchResult, build_session, check_content_length, check_content_type,
+        conditional_headers, read_capped
+    )
+    from rate_limit import HostScheduler
+    from inverted_index import InvertedIndex
+    from llm import FakeLLMClient, GeminiClient, LLMClient, LLMResponse
+    from metrics import PipelineMetrics, start_http_server
+    from search_backends import DuckDuckGoBackend, IndexBackend, LocalCorpusBackend, SearchBackend
+    from timing import SpanLog, StageTimer, span, summarize_spans
+    from url_utils import dedupe_urls, url_key
 
 @dataclass
 class ArticleInfo:
@@ -21,36 +65,302 @@ class ArticleInfo:
     authors: Optional[List[str]] = None
     source: Optional[str] = None
     claim: Optional[str] = None
+    # URLs of near-duplicate copies (e.g. syndicated wire stories) collapsed into this article
+    duplicate_urls: Optional[List[str]] = None
+
+    def to_cache(self) -> Dict[str, Any]:
+        """Serializable form stored in the article cache (claim is per-request)."""
+        return {
+            "url": self.url,
+            "title": self.title,
+            "content": self.content,
+            "date": self.date.isoformat() if self.date else None,
+            "authors": self.authors,
+            "source": self.source,
+        }
+
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any], claim: Optional[str] = None) -> 'ArticleInfo':
+        date = data.get("date")
+        return cls(
+            url=data["url"],
+            title=data.get("title"),
+            content=data.get("content"),
+            date=datetime.fromisoformat(date) if date else None,
+            authors=data.get("authors"),
+            source=data.get("source"),
+            claim=claim
+        )
+
+@dataclass
+class PipelineEvent:
+    """Progress record yielded by SourceRetriever.iter_search_and_process_articles.
+
+    kind is "search" (queries and urls set), "article" (index is the URL's
+    position in urls), "duplicates" (duplicates maps the index of each
+    article folded into a higher-ranked copy to that copy's index),
+    "verification" or "timings" (the claim's stage spans, always last).
+    """
+    kind: str
+    queries: Optional[List[str]] = None
+    urls: Optional[List[str]] = None
+    index: Optional[int] = None
+    article: Optional[ArticleInfo] = None
+    verification: Optional[Dict[str, Any]] = None
+    raw_response: Optional[str] = None
+    timings: Optional[List[Dict[str, Any]]] = None
+    duplicates: Optional[Dict[int, int]] = None
+
+
+DUCKDUCKGO_URL = "https://duckduckgo.com/html/"
+
+
+def parse_article_html(url: str, html: bytes, encoding: Optional[str] = None,
+                       claim: Optional[str] = None) -> ArticleInfo:
+    """Parse raw article HTML into an ArticleInfo.
+
+    Module-level and free of retriever state so it can run in a worker
+    process. Without a declared encoding the bytes are passed to newspaper,
+    which detects the charset itself.
+    """
+    from newspaper import Article
+
+    if encoding:
+        html = html.decode(encoding, errors="replace")
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    return ArticleInfo(
+        url=url,
+        title=article.title,
+        content=article.text,
+        date=article.publish_date,
+        authors=article.authors,
+        source=urlparse(url).netloc,
+        claim=claim
+    )
+
+
+def decompose_prompt(claim: str) -> str:
+    """Prompt asking Gemini for the search queries needed to verify a claim."""
+    return f"""
+            You must respond with valid JSON only. We want to verify the given claim:
+            
+            Claim: {claim}
+
+            To verify the claim we would need to search for articles and webpages that would contain 
+            the necessary information to draw conclusions about the claim. Provide the minimum number of queries needed to have all the necessary information on hand.
+            
+            Respond with this exact JSON structure, no other text:
+            {{
+                "search_queries": ["<query>"]
+            }}
+            """
+
+
+def verification_prompt(claim: str, context: str) -> str:
+    """Prompt asking Gemini for a JSON verdict on a claim given article context."""
+    return f"""
+            You must respond with valid JSON only. Analyze this claim using the provided context:
+            
+            Claim: {claim}
+            
+            Context:
+            {context}
+            
+            Respond with this exact JSON structure, no other text:
+            {{
+                "claim": "{claim}",
+                "verdict": "<TRUE/FALSE/PARTIALLY TRUE/INSUFFICIENT EVIDENCE>",
+                "confidence": "<HIGH/MEDIUM/LOW>",
+                "explanation": "<your explanation>",
+                "supporting_evidence": ["<evidence1>", "<evidence2>"],
+                "contrary_evidence": ["<evidence1>", "<evidence2>"],
+                "limitations": ["<limitation1>", "<limitation2>"]
+            }}
+            """
+
 
 class SourceRetriever:
-    def __init__(self, gemini_api_key: Optional[str] = None):
+    def __init__(self, gemini_api_key: Optional[str] = None, max_workers: int = 8,
+                 max_per_host: int = 2, search_rate: float = 2.0, search_burst: int = 4,
+                 session: Optional[requests.Session] = None, pool_connections: int = 16,
+                 pool_maxsize: Optional[int] = None, max_retries: int = 2, timeout: float = 10.0,
+                 cache_dir: Optional[str] = None, article_cache_ttl: Optional[float] = 7 * 24 * 3600,
+                 article_cache_max_entries: int = 10000, search_cache_ttl: Optional[float] = 3600,
+                 response_cache_ttl: Optional[float] = 30 * 24 * 3600,
+                 response_cache_max_entries: int = 5000, context_token_budget: int = 8000,
+                 passage_tokens: int = 200, top_passages: Optional[int] = 20,
+                 rank_passages: bool = True, parse_workers: int = 0, host_rate: float = 1.0,
+                 host_burst: int = 2, max_connections: int = 16, connect_timeout: float = 5.0,
+                 download_deadline: float = 30.0, max_download_bytes: int = 5 * 1024 * 1024,
+                 article_cache_max_stale: float = 30 * 24 * 3600,
+                 search_backends: Optional[List[SearchBackend]] = None,
+                 article_index: Optional[InvertedIndex] = None,
+                 dedup_threshold: Optional[float] = 0.8, timings_path: Optional[str] = None,
+                 metrics: Optional[PipelineMetrics] = None, llm_client: Optional[LLMClient] = None):
         self.headers = {"User-Agent": "Mozilla/5.0"}
-        if gemini_api_key:
-            genai.configure(api_key=gemini_api_key)
-            self.model = genai.GenerativeModel('gemini-pro')
+        # Keep-alive session shared by search and article downloads
+        # timeout is the read timeout (max gap between bytes); download_deadline
+        # bounds a whole article download and max_download_bytes its size
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.download_deadline = download_deadline
+        self.max_download_bytes = max_download_bytes
+        self.session = session or build_session(
+            self.headers,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize or max(max_workers, 10),
+            max_retries=max_retries
+        )
+        # Parsed articles persisted across runs, keyed by canonical URL; expired
+        # entries are kept for article_cache_max_stale seconds for revalidation
+        self.article_cache = None
+        if cache_dir:
+            self.article_cache = ArticleCache(
+                str(Path(cache_dir) / "articles.sqlite"),
+                ttl=article_cache_ttl,
+                max_entries=article_cache_max_entries,
+                max_stale=article_cache_max_stale
+            )
+        # In-memory query cache, persisted next to the article cache when cache_dir is set
+        self.search_cache = SearchCache(
+            str(Path(cache_dir) / "search.sqlite") if cache_dir else None,
+            ttl=search_cache_ttl
+        )
+        # Bounds the verification prompt regardless of how many sources were found
+        self.context_builder = ContextBuilder(
+            context_token_budget,
+            passage_tokens,
+            scorer=bm25_passage_scores if rank_passages else None,
+            top_k=top_passages
+        )
+        # Politeness: per-host token buckets and concurrency caps plus a global
+        # connection cap, shared by every search and download (and every claim)
+        self.scheduler = HostScheduler(
+            rate_per_host=host_rate,
+            burst_per_host=host_burst,
+            max_per_host=max_per_host,
+            max_total=max_connections,
+            host_limits={DUCKDUCKGO_URL: (search_rate, search_burst, search_burst)}
+        )
+        # CPU-bound HTML parsing runs in worker processes when parse_workers > 0
+        self.parse_workers = max(0, parse_workers)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pool_lock = threading.Lock()
+        if self.parse_workers:
+            # Created here, before any download threads exist
+            self._get_parse_pool()
+        # Concurrency limit for article extraction
+        self.max_workers = max(1, max_workers)
+        # Model for decomposition and verification: Gemini when a key is given,
+        # or any LLMClient (e.g. FakeLLMClient for offline load tests)
+        if llm_client is None and gemini_api_key:
+            llm_client = GeminiClient(gemini_api_key)
+        self.llm = llm_client
+        # Gemini replies keyed on model + prompt; on disk when cache_dir is set
+        if cache_dir:
+            self.response_cache = DiskCache(
+                str(Path(cache_dir) / "gemini.sqlite"),
+                ttl=response_cache_ttl,
+                max_entries=response_cache_max_entries
+            )
         else:
-            self.model = None
-        
+            self.response_cache = MemoryCache(ttl=response_cache_ttl)
+        # Where candidate URLs come from; live DuckDuckGo search by default
+        self.search_backends = search_backends or [DuckDuckGoBackend(self)]
+        # Local full-text index that downloaded articles are added to
+        self.article_index = article_index
+        # Minimum estimated Jaccard similarity for collapsing near-duplicate articles (None disables)
+        self.dedup_threshold = dedup_threshold
+        # Per-claim stage timings are appended here as JSON lines when set
+        self.span_log = SpanLog(timings_path) if timings_path else None
+        # Counters and histograms, fed from each claim's spans and from Gemini calls
+        self.metrics = metrics or PipelineMetrics()
+        self.metrics.registry.callback(
+            "origin_cache_lookups_total", "Cache lookups by cache and result", "counter",
+            ["cache", "result"], self._cache_lookups
+        )
+
     def search_articles_duckduckgo(self, query: str, num_results: int = 10) -> List[str]:
         """Search for articles using DuckDuckGo."""
+        cached = self.search_cache.get_results(query, num_results)
+        if cached is not None:
+            return cached
         try:
-            response = requests.get(
-                "https://duckduckgo.com/html/",
-                params={"q": query},
-                headers=self.headers
-            )
-            soup = BeautifulSoup(response.content, "html.parser")
-            results = []
-            for link in soup.find_all("a", {"class": "result__a"}, limit=num_results):
-                url = link["href"]
-                original_url = self._unwrap_duckduckgo_url(url)
-                if original_url:
-                    results.append(original_url)
+            with self.scheduler.slot(DUCKDUCKGO_URL):
+                response = self.session.get(
+                    DUCKDUCKGO_URL,
+                    params={"q": query},
+                    timeout=(self.connect_timeout, self.timeout)
+                )
+            self._note_throttling(DUCKDUCKGO_URL, response.status_code, response.headers)
+            # A throttle or error page has no results worth parsing
+            response.raise_for_status()
+            results = self.parse_search_results(response.content, num_results)
+            # Empty pages are usually throttling, so don't remember them
+            if results:
+                self.search_cache.set_results(query, num_results, results)
             return results
         except Exception as e:
             print(f"Error during search: {e}")
             return []
 
+    def parse_search_results(self, html: bytes, num_results: int) -> List[str]:
+        """Extract result URLs from a DuckDuckGo HTML results page, de-duplicated by url_key."""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        results = []
+        for link in soup.find_all("a", {"class": "result__a"}, limit=num_results):
+            url = link["href"]
+            original_url = self._unwrap_duckduckgo_url(url)
+            if original_url:
+                results.append(original_url)
+        return dedupe_urls(results)
+
+    @staticmethod
+    def _merge_ranked(result_lists: List[List[str]]) -> List[str]:
+        """Merge per-query result lists rank by rank, dropping duplicate articles."""
+        merged = []
+        for rank in range(max((len(results) for results in result_lists), default=0)):
+            for results in result_lists:
+                if rank < len(results):
+                    merged.append(results[rank])
+        return dedupe_urls(merged)
+
+    def search_many(self, queries: List[str], num_results: int = 10,
+                    timer: Optional[StageTimer] = None) -> List[str]:
+        """Run several queries concurrently on every search backend and merge them into one ranked URL list."""
+        tasks = [(backend, query) for query in queries for backend in self.search_backends]
+        if not tasks:
+            return []
+
+        def run(task) -> List[str]:
+            backend, query = task
+            with span(timer, "search", backend=backend.name, query=query) as search_span:
+                try:
+                    results = backend.search(query, num_results)
+                except Exception as e:
+                    # One failing backend or query must not sink the others
+                    print(f"Error searching {backend.name}: {e}")
+                    search_span["error"] = f"{type(e).__name__}: {e}"
+                    results = []
+                search_span["results"] = len(results)
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            result_lists = list(executor.map(run, tasks))
+        return self._merge_ranked(result_lists)
+
+    def backend_article(self, url: str, claim: Optional[str] = None) -> Optional[ArticleInfo]:
+        """Article held by a search backend (e.g. a local corpus), served without downloading."""
+        for backend in self.search_backends:
+            document = backend.get_article(url)
+            if document:
+                return ArticleInfo.from_cache(document, claim)
+        return None
+
     def _unwrap_duckduckgo_url(self, wrapped_url: str) -> Optional[str]:
         """Unwrap DuckDuckGo redirect URLs."""
         try:
@@ -63,147 +373,379 @@ class SourceRetriever:
             print(f"Error unwrapping URL: {e}")
             return None
 
-    def extract_article_info(self, url: str, claim: Optional[str] = None) -> Optional[ArticleInfo]:
-        """Extract information from an article."""
-        try:
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            return ArticleInfo(
-                url=url,
-                title=article.title,
-                content=article.text,
-                date=article.publish_date,
-                authors=article.authors,
-                source=urlparse(url).netloc,
-                claim=claim
+    def fetch_html(self, url: str, cached: Optional[Dict[str, Any]] = None) -> FetchResult:
+        """Download a page over the shared session.
+
+        Non-HTML responses, bodies over max_download_bytes and downloads
+        running past download_deadline are rejected with DownloadRejected.
+        With a cached record carrying ETag/Last-Modified validators the request
+        is conditional, and a 304 comes back as not_modified with no body.
+        The encoding is the declared charset (None if the server sent none,
+        leaving detection to the parser).
+        """
+        headers = conditional_headers(cached.get("etag"), cached.get("last_modified")) if cached else {}
+        with self.scheduler.slot(url):
+            response = self.session.get(
+                url, headers=headers, timeout=(self.connect_timeout, self.timeout), stream=True
             )
+            try:
+                if response.status_code == 304:
+                    return FetchResult(not_modified=True)
+                self._note_throttling(url, response.status_code, response.headers)
+                response.raise_for_status()
+                check_content_type(response.headers.get('content-type'))
+                check_content_length(response.headers.get('content-length'), self.max_download_bytes)
+                body = read_capped(response, self.max_download_bytes, self.download_deadline)
+            finally:
+                response.close()
+        content_type = response.headers.get('content-type', '')
+        return FetchResult(
+            body=body,
+            encoding=response.encoding if 'charset' in content_type.lower() else None,
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified')
+        )
+
+    def _note_throttling(self, url: str, status: int, headers: Mapping[str, str]):
+        """Back off a host that answered 429/503 for its Retry-After seconds.
+
+        Only pushes back the host's next rate token, so it never blocks and
+        may be called while holding the host's slot.
+        """
+        if status not in (429, 503):
+            return
+        try:
+            delay = float(headers.get("Retry-After", ""))
+        except ValueError:
+            delay = 30.0
+        print(f"Throttled by {HostScheduler.host_of(url)}, backing off {delay:.0f}s")
+        self.scheduler.backoff(url, delay)
+
+    def parse_article(self, url: str, html: bytes, encoding: Optional[str] = None,
+                      claim: Optional[str] = None) -> ArticleInfo:
+        """Parse downloaded HTML, on the parse process pool when one is configured."""
+        if self.parse_workers:
+            return self._get_parse_pool().submit(parse_article_html, url, html, encoding, claim).result()
+        return parse_article_html(url, html, encoding, claim)
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                # Workers are spawned, not forked: forking a process with running
+                # download threads can copy locks those threads hold (e.g. the import lock)
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._parse_pool
+
+    def extract_article_info(self, url: str, claim: Optional[str] = None,
+                             timer: Optional[StageTimer] = None) -> Optional[ArticleInfo]:
+        """Extract information from an article.
+
+        With a timer, records a "fetch" span (source is backend, cache,
+        revalidated or network) and, for downloaded pages, a "parse" span.
+        """
+        cache_key = url_key(url) or url
+        stale = None
+        try:
+            with span(timer, "fetch", url=url) as fetch_span:
+                local = self.backend_article(url, claim)
+                if local:
+                    fetch_span["source"] = "backend"
+                    return local
+                if self.article_cache:
+                    cached = self.article_cache.get_article(cache_key)
+                    if cached:
+                        fetch_span["source"] = "cache"
+                        return ArticleInfo.from_cache(cached, claim)
+                    # Expired entries with validators are revalidated rather than refetched
+                    stale = self.article_cache.get_stale_article(cache_key)
+                print(f"Processing: {url}")
+                fetched = self.fetch_html(url, stale)
+                fetch_span["source"] = "revalidated" if fetched.not_modified else "network"
+                fetch_span["bytes"] = len(fetched.body or b"")
+            if fetched.not_modified:
+                self.article_cache.mark_revalidated(cache_key)
+                return ArticleInfo.from_cache(stale, claim)
+            with span(timer, "parse", url=url):
+                article_info = self.parse_article(url, fetched.body, fetched.encoding, claim)
+            if self.article_cache:
+                self._store_article(cache_key, article_info, fetched, stale is not None)
+            if self.article_index is not None:
+                self.article_index.add(article_info.to_cache())
+            return article_info
         except Exception as e:
             print(f"Error extracting content from {url}: {e}")
             return None
 
-    def decompose_claim_with_gemini(self, claim: str):
-        if not self.model:
-            print("Gemini API key not configured")
-            return None
+    def _store_article(self, cache_key: str, article_info: ArticleInfo, fetched: FetchResult,
+                       was_stale: bool = False):
+        """Cache a freshly parsed article along with its response validators."""
+        record = article_info.to_cache()
+        record["etag"] = fetched.etag
+        record["last_modified"] = fetched.last_modified
+        self.article_cache.set_article(cache_key, record)
+        if was_stale:
+            self.article_cache.refetched += 1
+
+    def _cache_lookups(self) -> Dict[Tuple[str, str], float]:
+        """Hit and miss counts of each cache, for the metrics registry."""
+        caches = {"search": self.search_cache, "gemini": self.response_cache}
+        if self.article_cache:
+            caches["article"] = self.article_cache
+        lookups = {}
+        for name, cache in caches.items():
+            lookups[(name, "hit")] = cache.hits
+            lookups[(name, "miss")] = cache.misses
+        return lookups
+
+    def close(self):
+        """Release pooled connections, parse workers and cache handles."""
+        self.session.close()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(cancel_futures=True)
+            self._parse_pool = None
+        self.search_cache.close()
+        if isinstance(self.response_cache, DiskCache):
+            self.response_cache.close()
+        if self.article_cache:
+            self.article_cache.close()
+        for backend in self.search_backends:
+            backend.close()
+        if self.article_index is not None:
+            self.article_index.close()
+        if self.llm is not None:
+            self.llm.close()
+
+    @staticmethod
+    def _interleave_by_host(urls: List[str]) -> List[int]:
+        """Order URL indices round-robin across hosts so one busy host doesn't starve the pool."""
+        by_host: Dict[str, List[int]] = OrderedDict()
+        for i, url in enumerate(urls):
+            by_host.setdefault(HostScheduler.host_of(url), []).append(i)
+        order = []
+        queues = list(by_host.values())
+        while queues:
+            for queue in queues:
+                order.append(queue.pop(0))
+            queues = [queue for queue in queues if queue]
+        return order
+
+    def iter_extract_articles(self, urls: List[str], claim: Optional[str] = None,
+                              timer: Optional[StageTimer] = None) -> Iterator[Tuple[int, Optional[ArticleInfo]]]:
+        """Extract articles concurrently, yielding (index into urls, article) as each one finishes."""
+        if not urls:
+            return
+        workers = min(self.max_workers, len(urls))
+        if workers == 1:
+            for i, url in enumerate(urls):
+                yield i, self.extract_article_info(url, claim, timer)
+            return
 
+        executor = ThreadPoolExecutor(max_workers=workers)
         try:
-            prompt = f"""
-            You must respond with valid JSON only. We want to verify the given claim:
-            
-            Claim: {claim}
+            futures = {
+                executor.submit(self.extract_article_info, urls[i], claim, timer): i
+                for i in self._interleave_by_host(urls)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Don't start pending downloads if the caller stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            To verify the claim we would need to search for articles and webpages that would contain 
-            the necessary information to draw conclusions about the claim. Provide the minimum number of queries needed to have all the necessary information on hand.
-            
-            Respond with this exact JSON structure, no other text:
-            {{
-                "search_queries": ["<query>"]
-            }}
-            """
+    def duplicate_detector(self) -> Optional[NearDuplicateDetector]:
+        """Fresh per-claim near-duplicate detector, or None if deduplication is disabled."""
+        if not self.dedup_threshold:
+            return None
+        try:
+            from .dedup import NearDuplicateDetector
+        except ImportError:  # Running as a script from src/core
+            from dedup import NearDuplicateDetector
+        return NearDuplicateDetector(self.dedup_threshold)
 
-            response = self.model.generate_content(prompt)
-            
-            # Store raw response
-            raw_response = response.text if response.parts else "No response generated"
-            
-            # Try to parse JSON response
-            if response.parts:
-                try:
-                    result = json.loads(response.text)
-                    return result, raw_response
-                except json.JSONDecodeError:
-                    print(f"Failed to parse JSON. Raw response: {raw_response}")
-                    return None, raw_response
+    def collapse_duplicates(self, found: Dict[int, ArticleInfo]) -> Dict[int, int]:
+        """Fold near-duplicates in found into their highest-ranked copy; returns {dropped index: kept index}.
+
+        Runs in search-rank order once extraction has finished, so the kept
+        copy never depends on download timing. Dropped articles are removed
+        from found and listed in the kept copy's duplicate_urls.
+        """
+        detector = self.duplicate_detector()
+        collapsed: Dict[int, int] = {}
+        if detector is None:
+            return collapsed
+        for i in sorted(found):
+            article_info = found[i]
+            if not article_info.content:
+                continue
+            representative = detector.add(i, article_info.content)
+            if representative is not None:
+                original = found[representative]
+                original.duplicate_urls = (original.duplicate_urls or []) + [article_info.url]
+                collapsed[i] = representative
+        for i in collapsed:
+            del found[i]
+        return collapsed
+
+    def extract_articles(self, urls: List[str], claim: Optional[str] = None) -> List[Optional[ArticleInfo]]:
+        """Extract articles concurrently, returning results in the original URL order."""
+        results: List[Optional[ArticleInfo]] = [None] * len(urls)
+        for i, article_info in self.iter_extract_articles(urls, claim):
+            results[i] = article_info
+        return results
+
+    def _cached_response(self, prompt: str) -> Tuple[str, Optional[str]]:
+        """Cache key for a prompt and the stored Gemini reply, if any."""
+        cache_key = content_key(self.llm.model_name, prompt)
+        raw_response = self.response_cache.get(cache_key)
+        if raw_response is not None:
+            print("Using cached Gemini response")
+        return cache_key, raw_response
+
+    def _generate_json(self, prompt: str):
+        """Call Gemini and parse its JSON reply, reusing cached replies for identical prompts."""
+        cache_key, raw_response = self._cached_response(prompt)
+        if raw_response is not None:
+            return self._parse_response(cache_key, raw_response, cached=True)
+        started = time.perf_counter()
+        response = self.llm.generate(prompt)
+        self._record_gemini_usage(prompt, response, time.perf_counter() - started)
+        if response.text is None:
+            return None, "No response generated"
+        return self._parse_response(cache_key, response.text, cached=False)
+
+    def _record_gemini_usage(self, prompt: str, response: LLMResponse, seconds: float):
+        """Feed request latency and token counts to the metrics, estimating tokens if the model reports none."""
+        prompt_tokens = response.prompt_tokens or estimate_tokens(prompt)
+        output_tokens = response.output_tokens
+        if output_tokens is None:
+            output_tokens = estimate_tokens(response.text) if response.text is not None else 0
+        self.metrics.observe_gemini(seconds, prompt_tokens, output_tokens)
+
+    def _parse_response(self, cache_key: str, raw_response: str, cached: bool):
+        """Parse a Gemini reply as JSON, caching it if it is fresh and well-formed."""
+        try:
+            result = json.loads(raw_response)
+        except json.JSONDecodeError:
+            print(f"Failed to parse JSON. Raw response: {raw_response}")
             return None, raw_response
+        # Only well-formed replies are worth replaying
+        if not cached:
+            self.response_cache.set(cache_key, raw_response)
+        return result, raw_response
+
+    def decompose_claim_with_gemini(self, claim: str):
+        if not self.llm:
+            print("Gemini API key not configured")
+            return None
+
+        try:
+            prompt = decompose_prompt(claim)
+            return self._generate_json(prompt)
         except Exception as e:
             print(f"Error during claim verification: {e}")
             return None, str(e)
 
     def verify_claim_with_gemini(self, claim: str, context: str) -> Optional[Dict[str, Any]]:
         """Verify a claim using Gemini API with provided context."""
-        if not self.model:
+        if not self.llm:
             print("Gemini API key not configured")
             return None
 
         try:
-            prompt = f"""
-            You must respond with valid JSON only. Analyze this claim using the provided context:
-            
-            Claim: {claim}
-            
-            Context:
-            {context}
-            
-            Respond with this exact JSON structure, no other text:
-            {{
-                "claim": "{claim}",
-                "verdict": "<TRUE/FALSE/PARTIALLY TRUE/INSUFFICIENT EVIDENCE>",
-                "confidence": "<HIGH/MEDIUM/LOW>",
-                "explanation": "<your explanation>",
-                "supporting_evidence": ["<evidence1>", "<evidence2>"],
-                "contrary_evidence": ["<evidence1>", "<evidence2>"],
-                "limitations": ["<limitation1>", "<limitation2>"]
-            }}
-            """
-
-            response = self.model.generate_content(prompt)
-            
-            # Store raw response
-            raw_response = response.text if response.parts else "No response generated"
-            
-            # Try to parse JSON response
-            if response.parts:
-                try:
-                    result = json.loads(response.text)
-                    return result, raw_response
-                except json.JSONDecodeError:
-                    print(f"Failed to parse JSON. Raw response: {raw_response}")
-                    return None, raw_response
-            return None, raw_response
+            prompt = verification_prompt(claim, context)
+            return self._generate_json(prompt)
         except Exception as e:
             print(f"Error during claim verification: {e}")
             return None, str(e)
 
-    def search_and_process_articles(self, claim: str, num_results: int = 10, verify: bool = False) -> pd.DataFrame:
-        """Search and process articles relevant to a claim, optionally verify with Gemini."""
+    def iter_search_and_process_articles(self, claim: str, num_results: int = 10,
+                                         verify: bool = False) -> Iterator[PipelineEvent]:
+        """Streaming form of search_and_process_articles.
+
+        Yields a "search" event once URLs are known, an "article" event as soon
+        as each extraction finishes (in completion order), a "duplicates" event
+        naming the articles folded into a higher-ranked near-duplicate (only
+        if there were any), a "verification" event when verify is set, and
+        finally a "timings" event. Duplicates are only known once every
+        extraction has finished, so article events are never held back for them.
+        """
+        timer = StageTimer(claim)
         claims = []
-        if verify and self.model:
-            output = self.decompose_claim_with_gemini(claim)
+        if verify and self.llm:
+            with span(timer, "decompose"):
+                output = self.decompose_claim_with_gemini(claim)
             if output[0] is not None:
                 claims = output[0]["search_queries"]
         print("claims:", claims)
 
         print(f"Searching for articles relevant to the claim: {claim}")
-        urls = self.search_articles_duckduckgo(claim, num_results)
-        if len(claims) > 0:
-            for c in claims:
-                urls.extend(self.search_articles_duckduckgo(c, num_results))
-
-        data = []
-        context = ""
-        for url in urls:
-            print(f"Processing: {url}")
-            article_info = self.extract_article_info(url, claim)
+        urls = self.search_many([claim] + claims, num_results, timer)
+        yield PipelineEvent("search", queries=[claim] + claims, urls=urls)
+
+        found = {}
+        for i, article_info in self.iter_extract_articles(urls, claim, timer):
             if article_info:
-                data.append(article_info.__dict__)
-                if verify and article_info.content:
-                    context += article_info.content + "\n\n"
-
-        # print("Context:", context)
-        
-        results_df = pd.DataFrame(data)
-        
-        if verify and self.model:
-            verification_result, raw_response = self.verify_claim_with_gemini(claim, context)
+                found[i] = article_info
+                yield PipelineEvent("article", index=i, article=article_info)
+        duplicates = self.collapse_duplicates(found)
+        if duplicates:
+            yield PipelineEvent("duplicates", duplicates=duplicates)
+
+        if verify and self.llm:
+            articles = [found[i] for i in sorted(found)]
+            with span(timer, "context", articles=len(articles)) as context_span:
+                context = self.context_builder.build(
+                    [info for info in articles if info.content], [claim] + claims
+                )
+                context_span["chars"] = len(context)
+            with span(timer, "verify"):
+                verification_result, raw_response = self.verify_claim_with_gemini(claim, context)
             if verification_result:
                 print("\nClaim Verification Result:")
                 print(json.dumps(verification_result, indent=2))
-                results_df.attrs['verification'] = verification_result
-            results_df.attrs['raw_gemini_response'] = raw_response
-        
-        return results_df
+            yield PipelineEvent("verification", verification=verification_result, raw_response=raw_response)
+        yield self.timings_event(timer)
+
+    def timings_event(self, timer: StageTimer) -> PipelineEvent:
+        """Final event of a claim carrying its spans, which also feed the metrics and the timings log."""
+        records = timer.records()
+        self.metrics.observe_spans(records)
+        if self.span_log:
+            self.span_log.append(records)
+        return PipelineEvent("timings", timings=records)
+
+    def search_and_process_articles(self, claim: str, num_results: int = 10, verify: bool = False) -> pd.DataFrame:
+        """Search and process articles relevant to a claim, optionally verify with Gemini."""
+        return events_to_dataframe(self.iter_search_and_process_articles(claim, num_results, verify))
+
+
+def events_to_dataframe(events: Iterable[PipelineEvent]) -> pd.DataFrame:
+    """Collect pipeline events into the results DataFrame, articles in search order."""
+    import pandas as pd
+
+    found = {}
+    verification = None
+    timings = []
+    for event in events:
+        if event.kind == "article":
+            found[event.index] = event.article
+        elif event.kind == "duplicates":
+            for i in event.duplicates:
+                found.pop(i, None)
+        elif event.kind == "verification":
+            verification = event
+        elif event.kind == "timings":
+            timings = event.timings
+
+    results_df = pd.DataFrame([found[i].__dict__ for i in sorted(found)])
+    results_df.attrs['timings'] = timings
+    if verification:
+        if verification.verification:
+            results_df.attrs['verification'] = verification.verification
+        results_df.attrs['raw_gemini_response'] = verification.raw_response
+    return results_df
 
 
 def save_results(df: pd.DataFrame, output_path: str):
@@ -216,8 +758,7 @@ def save_results(df: pd.DataFrame, output_path: str):
     else:
         raise ValueError("Output file must be either .csv or .json")
 
-def run_test():
-    claims_to_test = [
+TEST_CLAIMS = [
     "MicroStrategy has benefited from the rally in cryptocurrencies this year", 
     "AI models are getting better almost every month right now", 
     "Sales of iPhone were up less than 1\% in fiscal 2024 (which ended in September)", 
@@ -227,13 +768,29 @@ def run_test():
     "The stock of Apple (NASDAQ: AAPL) is up 22% year to date in 2024", 
     "Nvidia's supply concerns, including delays with Blackwell AI chips, are reportedly resolved",
     "Amazon achieved record sales during Black Friday week in 2024, driven by early holiday discounts.",
-    ]
+]
+
+
+def run_test(retriever: SourceRetriever, num_results: int = 5, verify: bool = False,
+             max_concurrent_claims: int = 4, journal: Optional[BatchJournal] = None) -> pd.DataFrame:
+    """Run the benchmark claims through the batch pipeline."""
+    return run_batch(retriever, TEST_CLAIMS, num_results, verify, max_concurrent_claims, journal)
 
 
 def main():
     """Command line interface for source retrieval."""
     parser = argparse.ArgumentParser(description='Search and process articles for fact-checking.')
-    parser.add_argument('claim', help='The claim to verify')
+    parser.add_argument('claim', nargs='?', help='The claim to verify')
+    parser.add_argument('--batch', metavar='FILE',
+                      help='Verify every claim in a .csv (claim column), .jsonl or .txt file')
+    parser.add_argument('--run-test', action='store_true',
+                      help='Run the built-in benchmark claims in batch mode')
+    parser.add_argument('--claim-workers', type=int, default=4,
+                      help='Claims processed concurrently in batch mode (default: 4)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                      help='Run batch mode on an asyncio event loop (AsyncSourceRetriever)')
+    parser.add_argument('--journal', metavar='FILE',
+                      help='Checkpoint batch results to this JSON lines file and resume from it')
     parser.add_argument('-n', '--num-results', type=int, default=5,
                       help='Number of articles to retrieve (default: 5)')
     parser.add_argument('-o', '--output', help='Output file path (.csv or .json)')
@@ -242,10 +799,124 @@ def main():
     parser.add_argument('--gemini-key', help='Gemini API key for claim verification')
     parser.add_argument('--verify', action='store_true',
                       help='Verify claim using Gemini API')
+    parser.add_argument('-w', '--max-workers', type=int, default=8,
+                      help='Maximum concurrent article downloads (default: 8)')
+    parser.add_argument('--max-per-host', type=int, default=2,
+                      help='Maximum concurrent downloads from one host (default: 2)')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                      help='Processes for HTML parsing; 0 parses on the download threads (default: 0)')
+    parser.add_argument('--host-rate', type=float, default=1.0,
+                      help='Maximum requests per second to any one news host (default: 1.0)')
+    parser.add_argument('--max-connections', type=int, default=16,
+                      help='Maximum concurrent HTTP requests overall (default: 16)')
+    parser.add_argument('--search-rate', type=float, default=2.0,
+                      help='Maximum DuckDuckGo queries per second (default: 2.0)')
+    parser.add_argument('--timeout', type=float, default=10.0,
+                      help='HTTP read timeout in seconds (default: 10)')
+    parser.add_argument('--connect-timeout', type=float, default=5.0,
+                      help='HTTP connect timeout in seconds (default: 5)')
+    parser.add_argument('--download-deadline', type=float, default=30.0,
+                      help='Maximum seconds for one article download (default: 30)')
+    parser.add_argument('--max-download-mb', type=float, default=5.0,
+                      help='Abort article downloads larger than this many MB (default: 5)')
+    parser.add_argument('--cache-dir',
+                      help='Directory for persistent caches (disabled if not given)')
+    parser.add_argument('--cache-ttl', type=float, default=7 * 24 * 3600,
+                      help='Article cache time-to-live in seconds (default: 7 days)')
+    parser.add_argument('--search-cache-ttl', type=float, default=3600,
+                      help='Search result cache time-to-live in seconds (default: 3600)')
+    parser.add_argument('--context-tokens', type=int, default=8000,
+                      help='Token budget for the verification context (default: 8000)')
+    parser.add_argument('--top-passages', type=int, default=20,
+                      help='Keep only the N passages most relevant to the claim (default: 20)')
+    parser.add_argument('--search-backend', choices=['duckduckgo', 'local', 'all'], default='duckduckgo',
+                      help='Where to find sources: live DuckDuckGo search, the offline local corpus, '
+                           'or both (default: duckduckgo)')
+    parser.add_argument('--index', metavar='FILE',
+                      help='On-disk article index: downloaded articles are added to it and it is '
+                           'searched alongside the other backends')
+    parser.add_argument('--corpus', metavar='DIR',
+                      help='Directory of claim/url/content CSVs for the local backend (default: data/)')
+    parser.add_argument('--timings-out', metavar='FILE',
+                      help='Append per-claim stage timing spans to this JSON lines file')
+    parser.add_argument('--metrics-port', type=int,
+                      help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running')
+    parser.add_argument('--dedup-threshold', type=float, default=0.8,
+                      help='Similarity above which articles are collapsed as near-duplicates, '
+                           '0 to disable (default: 0.8)')
+    parser.add_argument('--llm', choices=['gemini', 'fake'], default='gemini',
+                      help='Model for --verify: Gemini, or a local fake with canned replies for '
+                           'load testing without quota or network (default: gemini)')
+    parser.add_argument('--fake-llm-latency-ms', type=float, default=1000.0,
+                      help='Simulated latency per call for --llm fake (default: 1000)')
 
     args = parser.parse_args()
+    if not (args.claim or args.batch or args.run_test):
+        parser.error('a claim, --batch FILE or --run-test is required')
     
-    retriever = SourceRetriever(gemini_api_key=args.gemini_key if args.verify else None)
+    llm_client = FakeLLMClient(latency=args.fake_llm_latency_ms / 1000) if args.llm == 'fake' else None
+    retriever = SourceRetriever(
+        gemini_api_key=args.gemini_key if args.verify and args.llm == 'gemini' else None,
+        llm_client=llm_client,
+        max_workers=args.max_workers,
+        max_per_host=args.max_per_host,
+        parse_workers=args.parse_workers,
+        host_rate=args.host_rate,
+        max_connections=args.max_connections,
+        search_rate=args.search_rate,
+        timeout=args.timeout,
+        connect_timeout=args.connect_timeout,
+        download_deadline=args.download_deadline,
+        max_download_bytes=int(args.max_download_mb * 1024 * 1024),
+        cache_dir=args.cache_dir,
+        article_cache_ttl=args.cache_ttl,
+        search_cache_ttl=args.search_cache_ttl,
+        context_token_budget=args.context_tokens,
+        top_passages=args.top_passages,
+        dedup_threshold=args.dedup_threshold,
+        timings_path=args.timings_out
+    )
+    if args.search_backend != 'duckduckgo':
+        corpus = LocalCorpusBackend.from_directory(args.corpus)
+        if args.search_backend == 'local':
+            retriever.search_backends = [corpus]
+        else:
+            retriever.search_backends.append(corpus)
+    if args.index:
+        retriever.article_index = InvertedIndex(args.index)
+        retriever.search_backends.append(IndexBackend(retriever.article_index))
+    if args.metrics_port:
+        start_http_server(retriever.metrics.registry, args.metrics_port)
+        print(f"Serving metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+
+    if args.batch or args.run_test:
+        journal = BatchJournal(args.journal) if args.journal else None
+        if args.use_async:
+            try:
+                from .async_retrieval import run_batch_async
+            except ImportError:  # Running as a script from src/core
+                from async_retrieval import run_batch_async
+            claims = load_claims(args.batch) if args.batch else TEST_CLAIMS
+            batch_df = asyncio.run(run_batch_async(
+                retriever, claims, args.num_results, args.verify, args.claim_workers, journal
+            ))
+        elif args.batch:
+            batch_df = run_batch(retriever, load_claims(args.batch), args.num_results,
+                                 args.verify, args.claim_workers, journal)
+        else:
+            batch_df = run_test(retriever, args.num_results, args.verify, args.claim_workers, journal)
+        if args.output:
+            save_results(batch_df, args.output)
+            print(f"\nBatch results saved to: {args.output}")
+        print("\nBatch summary:")
+        for idx, row in batch_df.iterrows():
+            status = row['error'] or row['verdict'] or f"{row['num_sources']} sources"
+            print(f"{idx + 1}. {row['claim'][:80]} -> {status}")
+        if llm_client:
+            print("Fake LLM:", json.dumps(llm_client.stats()))
+        retriever.close()
+        return
+
     results_df = retriever.search_and_process_articles(
         args.claim, 
         args.num_results,
@@ -277,5 +948,16 @@ def main():
         print("\nVerification Result:")
         print(json.dumps(results_df.attrs['verification'], indent=2))
 
+    if args.verbose:
+        print("\nSearch cache:", json.dumps(retriever.search_cache.stats()))
+        if retriever.article_cache:
+            print("Article cache:", json.dumps(retriever.article_cache.stats()))
+        if args.verify:
+            print("Gemini cache:", json.dumps(retriever.response_cache.stats()))
+        print("Stage timings:", json.dumps(summarize_spans(results_df.attrs['timings'])))
+        if llm_client:
+            print("Fake LLM:", json.dumps(llm_client.stats()))
+    retriever.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Per-stage timing spans for the retrieval pipeline.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Pipeline stages that record spans
+STAGES = ("decompose", "search", "fetch", "parse", "context", "verify")
+
+
+class StageTimer:
+    """Thread-safe collector of timing spans for one claim.
+
+    Each span is a flat record: claim, stage, start (Unix time),
+    duration_ms, plus stage attributes such as url, query or bytes.
+    """
+
+    def __init__(self, claim: Optional[str] = None):
+        self.claim = claim
+        self._spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, **attrs):
+        """Time a block; yields the attribute dict so the block can add details.
+
+        An exception escaping the block is recorded as the span's error and re-raised.
+        """
+        record = {"claim": self.claim, "stage": stage, "start": time.time()}
+        record.update(attrs)
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            with self._lock:
+                self._spans.append(record)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Spans in start order."""
+        with self._lock:
+            return sorted(self._spans, key=lambda record: record["start"])
+
+
+def span(timer: Optional[StageTimer], stage: str, **attrs):
+    """timer.span(...), or a no-op context yielding a throwaway dict when timer is None."""
+    return timer.span(stage, **attrs) if timer is not None else nullcontext({})
+
+
+def summarize_spans(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Count, total and max duration per stage."""
+    summary: Dict[str, Dict[str, float]] = {}
+    for record in records:
+        stage = summary.setdefault(record["stage"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stage["count"] += 1
+        stage["total_ms"] = round(stage["total_ms"] + record["duration_ms"], 3)
+        stage["max_ms"] = max(stage["max_ms"], record["duration_ms"])
+    return summary
+
+
+class SpanLog:
+    """Append-only JSON lines export of timing spans, shared across claims and threads."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def append(self, records: List[Dict[str, Any]]):
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
@@ -0,0 +1,88 @@
+"""
+URL canonicalization helpers used to de-duplicate search results before extraction.
+
+Canonical URLs are comparison keys only; pages are always fetched from the
+URL as found, since not every site serves https, AMP-free or
+parameter-free variants.
+"""
+
+import re
+from typing import List, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+# Query parameters that only carry tracking/session information
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "ref_url", "cmpid", "taid", "guccounter", "guce_referrer",
+    "guce_referrer_sig", "ocid", "sr_share", "smid", "soc_src",
+    "soc_trk", "outputtype", "amp",
+}
+TRACKING_PREFIXES = ("utm_", "__twitter", "_hs", "mkt_")
+
+_AMP_PATH_PREFIX = re.compile(r"^/amp(?=/)", re.IGNORECASE)
+_AMP_PATH_SUFFIX = re.compile(r"/amp/?$", re.IGNORECASE)
+_AMP_EXTENSION = re.compile(r"\.amp(\.html?)?$", re.IGNORECASE)
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """Normalize a URL so trivially different links to the same article compare equal.
+
+    Forces https, lowercases the host, drops default ports, fragments,
+    tracking parameters, AMP variants and trailing slashes, and sorts the
+    remaining query parameters. Returns None for non-http(s) URLs.
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except (AttributeError, ValueError):
+        return None
+    if parsed.scheme.lower() not in ("http", "https") or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower()
+    if host.startswith("amp."):
+        host = host[len("amp."):]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    path = parsed.path or "/"
+    path = _AMP_PATH_PREFIX.sub("", path)
+    path = _AMP_PATH_SUFFIX.sub("", path)
+    path = _AMP_EXTENSION.sub(lambda m: m.group(1) or "", path)
+    path = re.sub(r"/{2,}", "/", path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    if not path:
+        path = "/"
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    )
+    return urlunparse(("https", host, path, "", urlencode(query), ""))
+
+
+def url_key(url: str) -> Optional[str]:
+    """Key used for de-duplication: the canonical URL without a leading 'www.'."""
+    canonical = canonicalize_url(url)
+    if canonical is None:
+        return None
+    return re.sub(r"^https://www\.", "https://", canonical)
+
+
+def dedupe_urls(urls: List[str]) -> List[str]:
+    """Drop URLs whose url_key was already seen (or that are not http(s)), keeping first occurrences as given."""
+    seen = set()
+    unique = []
+    for url in urls:
+        key = url_key(url)
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+        unique.append(url.strip())
+    return unique
@@ -2,6 +2,13 @@ import streamlit as st
 from src.core.source_retrieval import SourceRetriever
 import pandas as pd
 
+
+@st.cache_resource
+def get_retriever(api_key=None):
+    """One retriever per API key, reused across reruns so its session, caches and model persist."""
+    return SourceRetriever(gemini_api_key=api_key)
+
+
 class SourceRetrieverUI:
     def __init__(self):
         self.retriever = None  # Initialize later with API key if provided
@@ -38,23 +45,6 @@ class SourceRetrieverUI:
             st.write("**Content:**")
             st.write(escape_markdown(row['content']))
 
-    def render_search_results(self, results_df: pd.DataFrame):
-        """Render search results in the Streamlit UI."""
-        st.header("Search Results")
-        if not results_df.empty:
-            for idx, row in results_df.iterrows():
-                self.render_article_info(idx, row)
-            
-            # Add download button for CSV
-            st.download_button(
-                label="Download results as CSV",
-                data=results_df.to_csv(index=False).encode('utf-8'),
-                file_name='search_results.csv',
-                mime='text/csv',
-            )
-        else:
-            st.warning("No results found.")
-
     def render_verification_result(self, verification_result, raw_response=None):
         """Render verification results in the Streamlit UI."""
         st.header("Claim Verification Result")
@@ -100,7 +90,7 @@ class SourceRetrieverUI:
                                       disabled=not bool(api_key))
 
         # Initialize retriever with API key if provided
-        self.retriever = SourceRetriever(gemini_api_key=api_key if verify_enabled else None)
+        self.retriever = get_retriever(api_key if verify_enabled else None)
         
         # Input section
         st.header("Enter Your Claim")
@@ -110,20 +100,48 @@ class SourceRetrieverUI:
         
         # Search button
         if st.button("Search for Sources") and claim:
-            with st.spinner('Searching and analyzing...'):
-                try:
-                    results_df = self.retriever.search_and_process_articles(
-                        claim, num_results, verify=verify_enabled
+            try:
+                st.header("Search Results")
+                status = st.status("Searching for sources...")
+                found = {}
+                verification = None
+                # Render each source as soon as it is extracted
+                for event in self.retriever.iter_search_and_process_articles(
+                    claim, num_results, verify=verify_enabled
+                ):
+                    if event.kind == "search":
+                        urls = event.urls
+                        status.update(label=f"Processing {len(event.urls)} sources...")
+                    elif event.kind == "article":
+                        found[event.index] = event.article
+                        self.render_article_info(len(found) - 1, pd.Series(event.article.__dict__))
+                        if verify_enabled and len(found) == 1:
+                            status.update(label="Processing sources and verifying claim...")
+                    elif event.kind == "duplicates":
+                        # Copies stay on screen but are left out of the download
+                        for i, kept in event.duplicates.items():
+                            found.pop(i, None)
+                            st.caption(f"{urls[i]} is a copy of {urls[kept]}")
+                    elif event.kind == "verification":
+                        verification = event
+                status.update(label=f"Found {len(found)} sources", state="complete")
+
+                results_df = pd.DataFrame([found[i].__dict__ for i in sorted(found)])
+                if not results_df.empty:
+                    st.download_button(
+                        label="Download results as CSV",
+                        data=results_df.to_csv(index=False).encode('utf-8'),
+                        file_name='search_results.csv',
+                        mime='text/csv',
                     )
-                    self.render_search_results(results_df)
-                    
-                    # Display verification results if available
-                    if verify_enabled:
-                        raw_response = results_df.attrs.get('raw_gemini_response')
-                        verification_result = results_df.attrs.get('verification')
-                        self.render_verification_result(verification_result, raw_response)
-                except Exception as e:
-                    st.error(f"An error occurred: {str(e)}")
+                else:
+                    st.warning("No results found.")
+
+                # Display verification results if available
+                if verify_enabled and verification:
+                    self.render_verification_result(verification.verification, verification.raw_response)
+            except Exception as e:
+                st.error(f"An error occurred: {str(e)}")
 
 if __name__ == "__main__":
     app = SourceRetrieverUI()
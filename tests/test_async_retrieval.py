@@ -0,0 +1,89 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.core.async_retrieval import AsyncSourceRetriever, _aiohttp
+from src.core.http_session import DownloadRejected
+from src.core.source_retrieval import SourceRetriever
+
+PAGE = (
+    "<html><head><title>Story</title></head><body><article><p>"
+    + " ".join(f"word{i}" for i in range(200))
+    + "</p></article></body></html>"
+).encode("utf-8")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """/page is HTML with an ETag (304 when revalidated), /image is a PNG and /big is oversized HTML."""
+
+    def do_GET(self):
+        if self.path == "/page" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        content_type, body = {
+            "/page": ("text/html; charset=utf-8", PAGE),
+            "/image": ("image/png", b"\x89PNG"),
+            "/big": ("text/html", b"x" * 64 * 1024),
+        }[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(_aiohttp(), "aiohttp is not installed")
+class NativeHttpTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.retriever = SourceRetriever(cache_dir=self.tmp.name, max_download_bytes=16 * 1024, host_rate=0)
+
+    def tearDown(self):
+        self.retriever.close()
+        self.tmp.cleanup()
+
+    def run_async(self, call):
+        async def run():
+            async_retriever = AsyncSourceRetriever(self.retriever)
+            self.assertTrue(async_retriever._native())
+            try:
+                return await call(async_retriever)
+            finally:
+                await async_retriever.close()
+
+        return asyncio.run(run())
+
+    def test_extracts_and_revalidates_article(self):
+        article = self.run_async(lambda r: r.extract_article_info(f"{self.base}/page"))
+        self.assertEqual(article.title, "Story")
+        fetched = self.run_async(lambda r: r.fetch_html(f"{self.base}/page", {"etag": '"v1"'}))
+        self.assertTrue(fetched.not_modified)
+
+    def test_rejects_non_html(self):
+        with self.assertRaises(DownloadRejected):
+            self.run_async(lambda r: r.fetch_html(f"{self.base}/image"))
+
+    def test_rejects_oversized_body(self):
+        with self.assertRaises(DownloadRejected):
+            self.run_async(lambda r: r.fetch_html(f"{self.base}/big"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.core.batch import BatchJournal, batch_settings, run_batch
+from src.core.context import ContextBuilder
+from src.core.llm import FakeLLMClient
+from src.core.search_backends import LocalCorpusBackend
+
+
+class RecordingRetriever:
+    """Minimal retriever that remembers which claims it processed."""
+
+    def __init__(self, llm=None, search_backends=(), context_builder=None):
+        self.llm = llm
+        self.search_backends = list(search_backends)
+        self.context_builder = context_builder or ContextBuilder()
+        self.processed = []
+
+    def search_and_process_articles(self, claim, num_results=10, verify=False):
+        self.processed.append((claim, num_results, verify))
+        df = pd.DataFrame([{"url": f"https://a.com/{i}", "title": claim} for i in range(num_results)])
+        if verify:
+            df.attrs["verification"] = {"verdict": "TRUE", "confidence": "HIGH"}
+        return df
+
+
+class BatchJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "journal.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resumes_completed_claims_with_same_settings(self):
+        run_batch(RecordingRetriever(), ["a", "b"], num_results=2, journal=BatchJournal(self.path))
+        retriever = RecordingRetriever()
+        df = run_batch(retriever, ["a", "b", "c"], num_results=2, journal=BatchJournal(self.path))
+        self.assertEqual(retriever.processed, [("c", 2, False)])
+        self.assertEqual(df["claim"].tolist(), ["a", "b", "c"])
+        self.assertNotIn("settings", df.columns)
+
+    def test_does_not_reuse_records_made_with_other_settings(self):
+        run_batch(RecordingRetriever(), ["a"], num_results=2, journal=BatchJournal(self.path))
+        retriever = RecordingRetriever(FakeLLMClient())
+        df = run_batch(retriever, ["a"], num_results=2, verify=True, journal=BatchJournal(self.path))
+        self.assertEqual(retriever.processed, [("a", 2, True)])
+        self.assertEqual(df["verdict"].tolist(), ["TRUE"])
+
+        retriever = RecordingRetriever()
+        run_batch(retriever, ["a"], num_results=3, journal=BatchJournal(self.path))
+        self.assertEqual(retriever.processed, [("a", 3, False)])
+
+    def test_does_not_reuse_records_from_other_sources_or_context(self):
+        corpus = LocalCorpusBackend([{"url": "https://a.com/x", "content": "alpha"}])
+        run_batch(RecordingRetriever(), ["a"], num_results=2, journal=BatchJournal(self.path))
+        retriever = RecordingRetriever(search_backends=[corpus])
+        run_batch(retriever, ["a"], num_results=2, journal=BatchJournal(self.path))
+        self.assertEqual(retriever.processed, [("a", 2, False)])
+
+        run_batch(RecordingRetriever(FakeLLMClient()), ["b"], num_results=2, verify=True,
+                  journal=BatchJournal(self.path))
+        retriever = RecordingRetriever(FakeLLMClient(), context_builder=ContextBuilder(token_budget=1000))
+        run_batch(retriever, ["b"], num_results=2, verify=True, journal=BatchJournal(self.path))
+        self.assertEqual(retriever.processed, [("b", 2, True)])
+
+    def test_context_settings_only_matter_when_verifying(self):
+        small = RecordingRetriever(FakeLLMClient(), context_builder=ContextBuilder(top_k=2))
+        self.assertEqual(batch_settings(small, 2, False), batch_settings(RecordingRetriever(), 2, False))
+        self.assertNotEqual(batch_settings(small, 2, True), batch_settings(RecordingRetriever(FakeLLMClient()), 2, True))
+
+    def test_failed_claims_are_retried(self):
+        journal = BatchJournal(self.path)
+        settings = {"num_results": 2, "verify": False, "model": None}
+        journal.append({"claim": "a", "error": "quota"}, settings)
+        self.assertEqual(journal.completed(settings), {})
+
+    def test_torn_final_line_is_ignored(self):
+        settings = {"num_results": 2, "verify": False, "model": None}
+        BatchJournal(self.path).append({"claim": "a", "error": None}, settings)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"claim": "b"')
+        journal = BatchJournal(self.path)
+        journal.append({"claim": "c", "error": None}, settings)
+        self.assertEqual(sorted(journal.completed(settings)), ["a", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
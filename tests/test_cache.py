@@ -0,0 +1,174 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.core.cache import ArticleCache, DiskCache, MemoryCache, SearchCache, content_key, normalize_query
+
+
+class FakeClock:
+    """Stands in for the time module inside src.core.cache."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class ClockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("src.core.cache.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+
+class KeyTest(unittest.TestCase):
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("  Is  the Earth ROUND? "), "is the earth round")
+
+    def test_content_key_separates_parts(self):
+        self.assertNotEqual(content_key("ab", "c"), content_key("a", "bc"))
+
+
+class MemoryCacheTest(ClockTestCase):
+    def test_ttl_expiry(self):
+        cache = MemoryCache(ttl=10)
+        cache.set("k", "v")
+        self.clock.advance(10)
+        self.assertEqual(cache.get("k"), "v")
+        self.clock.advance(1)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_created_at_is_respected(self):
+        cache = MemoryCache(ttl=10)
+        cache.set("k", "v", created_at=self.clock.now - 11)
+        self.assertIsNone(cache.get("k"))
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(ttl=None, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+
+class DiskCacheTest(ClockTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = DiskCache(self.path("cache.sqlite"), ttl=10, max_entries=3, max_stale=20)
+        self.addCleanup(self.cache.close)
+
+    def test_round_trip_and_persistence(self):
+        self.cache.set("k", {"a": [1, 2]})
+        self.assertEqual(self.cache.get("k"), {"a": [1, 2]})
+        reopened = DiskCache(self.path("cache.sqlite"), ttl=10)
+        try:
+            self.assertEqual(reopened.get("k"), {"a": [1, 2]})
+        finally:
+            reopened.close()
+
+    def test_ttl_and_stale_window(self):
+        self.cache.set("k", "v")
+        self.clock.advance(11)
+        self.assertIsNone(self.cache.get("k"))
+        self.assertEqual(self.cache.get_stale("k"), "v")
+        self.clock.advance(20)
+        self.assertIsNone(self.cache.get_stale("k"))
+
+    def test_touch_makes_an_entry_fresh(self):
+        self.cache.set("k", "v")
+        self.clock.advance(11)
+        self.cache.touch("k")
+        self.assertEqual(self.cache.get("k"), "v")
+
+    def test_get_entry_returns_creation_time(self):
+        created = self.clock.now
+        self.cache.set("k", "v")
+        self.clock.advance(5)
+        self.assertEqual(self.cache.get_entry("k"), ("v", created))
+
+    def test_lru_eviction_by_count(self):
+        for key in ("a", "b", "c"):
+            self.cache.set(key, key)
+            self.clock.advance(1)
+        self.cache.get("a")
+        self.clock.advance(1)
+        self.cache.set("d", "d")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual([self.cache.get(key) for key in ("a", "c", "d")], ["a", "c", "d"])
+
+    def test_eviction_by_size(self):
+        cache = DiskCache(self.path("small.sqlite"), ttl=None, max_bytes=200)
+        try:
+            for i in range(5):
+                cache.set(str(i), os.urandom(60).hex())
+                self.clock.advance(1)
+            self.assertLessEqual(cache.stats()["bytes"], 200)
+            self.assertIsNotNone(cache.get("4"))
+            self.assertIsNone(cache.get("0"))
+        finally:
+            cache.close()
+
+    def test_entries_past_the_stale_window_are_dropped_on_write(self):
+        self.cache.set("old", "v")
+        self.clock.advance(31)
+        self.cache.set("new", "v")
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+
+class ArticleCacheTest(ClockTestCase):
+    def test_only_articles_with_validators_are_revalidated(self):
+        cache = ArticleCache(self.path("articles.sqlite"), ttl=10, max_stale=100)
+        self.addCleanup(cache.close)
+        cache.set_article("https://a.com/x", {"url": "https://a.com/x", "etag": '"1"'})
+        cache.set_article("https://b.com/y", {"url": "https://b.com/y"})
+        self.clock.advance(11)
+        self.assertIsNone(cache.get_article("https://a.com/x"))
+        self.assertEqual(cache.get_stale_article("https://a.com/x")["etag"], '"1"')
+        self.assertIsNone(cache.get_stale_article("https://b.com/y"))
+        cache.mark_revalidated("https://a.com/x")
+        self.assertIsNotNone(cache.get_article("https://a.com/x"))
+        self.assertEqual(cache.stats()["revalidated"], 1)
+
+
+class SearchCacheTest(ClockTestCase):
+    def test_equivalent_queries_share_results(self):
+        cache = SearchCache(ttl=10)
+        cache.set_results("Is the earth round?", 5, ["https://a.com/x"])
+        self.assertEqual(cache.get_results("is the  earth round", 5), ["https://a.com/x"])
+        self.assertIsNone(cache.get_results("is the earth round", 6))
+
+    def test_results_expire(self):
+        cache = SearchCache(ttl=10)
+        cache.set_results("q", 5, ["u"])
+        self.clock.advance(11)
+        self.assertIsNone(cache.get_results("q", 5))
+
+    def test_disk_results_keep_their_age_in_memory(self):
+        first = SearchCache(self.path("search.sqlite"), ttl=10)
+        first.set_results("q", 5, ["u"])
+        first.close()
+        self.clock.advance(8)
+        cache = SearchCache(self.path("search.sqlite"), ttl=10)
+        self.addCleanup(cache.close)
+        self.assertEqual(cache.get_results("q", 5), ["u"])
+        self.clock.advance(3)
+        # Eleven seconds after it was stored, the memory copy must have expired too
+        self.assertIsNone(cache.get_results("q", 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from types import SimpleNamespace
+
+from src.core.context import ContextBuilder, estimate_tokens, split_passages
+
+
+def article(i, paragraphs):
+    return SimpleNamespace(
+        url=f"https://site{i}.com/story", title=f"Story {i}", source=f"site{i}.com",
+        content="\n\n".join(paragraphs),
+    )
+
+
+def paragraph(article_index, number, words=40):
+    return " ".join([f"a{article_index}p{number}"] * words)
+
+
+ARTICLES = [article(i, [paragraph(i, n) for n in range(4)]) for i in range(3)]
+
+
+class SplitPassagesTest(unittest.TestCase):
+    def test_short_fragments_are_dropped_and_passages_stay_within_limit(self):
+        text = "Share this\n\n" + "\n\n".join(paragraph(0, n) for n in range(6))
+        passages = split_passages(text, max_tokens=150)
+        self.assertNotIn("Share this", " ".join(passages))
+        self.assertTrue(all(estimate_tokens(p) <= 150 for p in passages))
+        self.assertEqual(" ".join(passages).split(), " ".join(paragraph(0, n) for n in range(6)).split())
+
+
+class ContextBuilderTest(unittest.TestCase):
+    def test_context_fits_the_token_budget(self):
+        for budget in (200, 500, 1000):
+            context = ContextBuilder(token_budget=budget, passage_tokens=100).build(ARTICLES)
+            self.assertLessEqual(estimate_tokens(context), budget)
+            self.assertIn("[Source 1: Story 0 (https://site0.com/story)]", context)
+
+    def test_lead_passages_are_taken_round_robin(self):
+        selected = ContextBuilder(token_budget=10000, passage_tokens=100, top_k=3).select(ARTICLES)
+        self.assertEqual([(p.article_index, p.passage_index) for p in selected], [(0, 0), (1, 0), (2, 0)])
+
+    def test_top_k_caps_passages_below_the_budget(self):
+        builder = ContextBuilder(token_budget=10000, passage_tokens=100)
+        self.assertEqual(len(builder.select(ARTICLES)), 6)
+        builder.top_k = 4
+        self.assertEqual(len(builder.select(ARTICLES)), 4)
+
+    def test_no_content_gives_empty_context(self):
+        self.assertEqual(ContextBuilder().build([article(0, ["too short"])]), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.core.async_retrieval import AsyncSourceRetriever, _aiohttp
+from src.core.http_session import DownloadRejected, build_session, check_content_length, read_capped
+from src.core.source_retrieval import SourceRetriever
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Answers /<status> with that status, counting requests per path."""
+
+    counts = {}
+
+    def do_GET(self):
+        StatusHandler.counts[self.path] = StatusHandler.counts.get(self.path, 0) + 1
+        status = int(self.path.strip("/"))
+        body = b"ok"
+        self.send_response(status)
+        if status in (429, 503):
+            self.send_header("Retry-After", "30")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DownloadHandler(BaseHTTPRequestHandler):
+    """/big is 64 KiB of HTML with no Content-Length, /trickle sends a byte every 0.1s, /pdf is a PDF."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf" if self.path == "/pdf" else "text/html")
+        self.end_headers()
+        try:
+            if self.path == "/trickle":
+                for _ in range(50):
+                    self.wfile.write(b"x")
+                    self.wfile.flush()
+                    time.sleep(0.1)
+            else:
+                self.wfile.write(b"x" * 64 * 1024)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StatusServerTest(unittest.TestCase):
+    handler = StatusHandler
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), cls.handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+class BuildSessionTest(StatusServerTest):
+    def setUp(self):
+        StatusHandler.counts.clear()
+        self.session = build_session(max_retries=2, backoff_factor=0)
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_throttling_is_returned_without_sleeping_on_retry_after(self):
+        for status in (429, 503):
+            started = time.perf_counter()
+            response = self.session.get(f"{self.base}/{status}", timeout=5)
+            self.assertEqual(response.status_code, status)
+            self.assertEqual(response.headers["Retry-After"], "30")
+            self.assertLess(time.perf_counter() - started, 2)
+            self.assertEqual(StatusHandler.counts[f"/{status}"], 1)
+
+    def test_server_errors_are_retried(self):
+        response = self.session.get(f"{self.base}/502", timeout=5)
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(StatusHandler.counts["/502"], 3)
+
+
+class ThrottlingBackoffTest(StatusServerTest):
+    def assert_backed_off(self, retriever, url):
+        # The host's next token now waits out the 30s Retry-After
+        self.assertGreater(retriever.scheduler.limiter(url).reserve(), 20)
+
+    def test_fetch_backs_off_throttling_host(self):
+        retriever = SourceRetriever()
+        try:
+            with self.assertRaises(requests.HTTPError):
+                retriever.fetch_html(f"{self.base}/429")
+            self.assert_backed_off(retriever, self.base)
+        finally:
+            retriever.close()
+
+    @unittest.skipUnless(_aiohttp(), "aiohttp is not installed")
+    def test_async_fetch_backs_off_throttling_host(self):
+        async def run(retriever):
+            async_retriever = AsyncSourceRetriever(retriever)
+            try:
+                with self.assertRaises(Exception):
+                    await async_retriever.fetch_html(f"{self.base}/503")
+            finally:
+                await async_retriever.close()
+
+        retriever = SourceRetriever()
+        try:
+            asyncio.run(run(retriever))
+            self.assert_backed_off(retriever, self.base)
+        finally:
+            retriever.close()
+
+    def test_async_connections_stay_within_global_cap(self):
+        retriever = SourceRetriever(max_connections=4)
+        async_retriever = AsyncSourceRetriever(retriever, max_in_flight=64)
+        try:
+            self.assertEqual(async_retriever._max_connections(), 4)
+        finally:
+            asyncio.run(async_retriever.close())
+            retriever.close()
+
+
+class DownloadLimitTest(StatusServerTest):
+    handler = DownloadHandler
+
+    def setUp(self):
+        self.session = build_session(max_retries=0)
+
+    def tearDown(self):
+        self.session.close()
+
+    def get(self, path):
+        return self.session.get(f"{self.base}{path}", timeout=5, stream=True)
+
+    def test_body_within_cap_is_read(self):
+        with self.get("/big") as response:
+            self.assertEqual(len(read_capped(response, 128 * 1024)), 64 * 1024)
+
+    def test_body_over_cap_is_rejected(self):
+        with self.get("/big") as response:
+            with self.assertRaisesRegex(DownloadRejected, "exceeded"):
+                read_capped(response, 16 * 1024, chunk_size=4096)
+
+    def test_declared_length_over_cap_is_rejected(self):
+        check_content_length("1024", 1024)
+        with self.assertRaises(DownloadRejected):
+            check_content_length("1025", 1024)
+
+    def test_trickling_download_is_cut_off_at_deadline(self):
+        started = time.monotonic()
+        with self.get("/trickle") as response:
+            with self.assertRaisesRegex(DownloadRejected, "longer than"):
+                read_capped(response, 1024, deadline=0.5)
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_non_html_is_rejected_before_the_body(self):
+        retriever = SourceRetriever(host_rate=0)
+        try:
+            with self.assertRaisesRegex(DownloadRejected, "application/pdf"):
+                retriever.fetch_html(f"{self.base}/pdf")
+            self.assertLess(len(retriever.fetch_html(f"{self.base}/big").body), retriever.max_download_bytes)
+        finally:
+            retriever.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
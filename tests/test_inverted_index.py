@@ -0,0 +1,161 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from src.core.inverted_index import (
+    InvertedIndex, decode_postings, decode_varint, encode_posting, encode_varint
+)
+from src.core.search_backends import IndexBackend
+
+
+def article(url, content, title=""):
+    return {"url": url, "title": title, "content": content}
+
+
+class PostingsEncodingTest(unittest.TestCase):
+    def test_varint_round_trip(self):
+        for value in (0, 1, 127, 128, 300, 2 ** 21, 2 ** 40):
+            out = bytearray()
+            encode_varint(value, out)
+            self.assertEqual(decode_varint(bytes(out), 0), (value, len(out)))
+
+    def test_postings_round_trip(self):
+        out = bytearray()
+        encode_posting(3, [0, 4, 9], out)
+        encode_posting(2, [1], out)
+        encode_posting(130, [7, 300], out)
+        self.assertEqual(list(decode_postings(bytes(out))), [(3, [0, 4, 9]), (5, [1]), (135, [7, 300])])
+
+
+class InvertedIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "index.sqlite")
+        self.index = InvertedIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def urls(self, query, **kwargs):
+        return [url for url, _ in self.index.search(query, **kwargs)]
+
+    def test_search_ranks_matching_documents(self):
+        self.index.add(article("https://a.com/x", "chip supply chain update"))
+        self.index.add(article("https://b.com/y", "chip chip chip shortage"))
+        self.assertEqual(self.urls("chip"), ["https://b.com/y", "https://a.com/x"])
+        self.assertEqual(self.urls("shortage"), ["https://b.com/y"])
+
+    def test_unchanged_readd_is_a_no_op(self):
+        self.assertTrue(self.index.add(article("https://a.com/x", "alpha beta")))
+        self.assertFalse(self.index.add(article("https://a.com/x", "alpha beta")))
+        self.assertEqual(len(self.index), 1)
+
+    def test_replacing_newest_document_drops_its_old_terms(self):
+        self.index.add(article("https://a.com/x", "nvidia earnings report"))
+        self.index.add(article("https://b.com/y", "nvidia blackwell chips delayed"))
+        self.index.add(article("https://b.com/y", "nvidia blackwell supply resolved"))
+        self.assertEqual(self.urls("delayed"), [])
+        self.assertEqual(self.urls("resolved"), ["https://b.com/y"])
+        self.assertEqual(len(self.index), 2)
+
+    def test_replacing_document_does_not_inflate_its_score(self):
+        self.index.add(article("https://a.com/x", "alpha beta gamma"))
+        self.index.add(article("https://c.com/z", "alpha delta epsilon"))
+        before = dict(self.index.search("alpha"))
+        self.index.add(article("https://c.com/z", "alpha delta zeta"))
+        after = dict(self.index.search("alpha"))
+        self.assertAlmostEqual(after["https://c.com/z"], before["https://c.com/z"])
+
+    def test_doc_ids_are_not_reused_after_reopen(self):
+        self.index.add(article("https://a.com/x", "alpha"))
+        self.index.add(article("https://b.com/y", "beta delayed"))
+        self.index.add(article("https://b.com/y", "beta resolved"))
+        self.index.close()
+        self.index = InvertedIndex(self.path)
+        self.index.add(article("https://c.com/z", "gamma"))
+        self.assertEqual(self.urls("delayed"), [])
+        self.assertEqual(self.urls("gamma"), ["https://c.com/z"])
+
+    def test_phrase_search(self):
+        self.index.add(article("https://a.com/x", "supply chain disruption"))
+        self.index.add(article("https://b.com/y", "chain of supply"))
+        self.assertEqual(self.urls("supply chain", phrase=True), ["https://a.com/x"])
+
+    def test_buffered_postings_are_searchable_and_persist(self):
+        self.index.add(article("https://a.com/x", "alpha beta"))
+        self.assertEqual(self.index.stats()["segments"], 0)
+        self.assertEqual(self.urls("alpha"), ["https://a.com/x"])
+        self.index.close()
+        self.index = InvertedIndex(self.path)
+        self.assertEqual(self.urls("alpha"), ["https://a.com/x"])
+
+    def test_unflushed_postings_are_rebuilt_on_open(self):
+        self.index.add(article("https://a.com/x", "alpha beta"))
+        # Simulate a crash: the document row is committed but the buffer is lost
+        self.index._conn.close()
+        self.index = InvertedIndex(self.path)
+        self.assertEqual(self.urls("beta"), ["https://a.com/x"])
+
+    def test_segments_are_merged_and_purged(self):
+        self.index.close()
+        self.index = InvertedIndex(self.path, flush_every=1, max_segments=3)
+        for i in range(10):
+            self.index.add(article(f"https://a.com/{i}", f"common story number{i}"))
+        self.index.add(article("https://a.com/0", "common story rewritten"))
+        self.assertLessEqual(self.index.stats()["segments"] / self.index.stats()["terms"], 3)
+        self.assertEqual(len(self.urls("common", num_results=20)), 10)
+        self.assertEqual(self.urls("number0"), [])
+        reference = InvertedIndex(os.path.join(self.tmp.name, "reference.sqlite"), flush_every=1000)
+        try:
+            for i in range(1, 10):
+                reference.add(article(f"https://a.com/{i}", f"common story number{i}"))
+            reference.add(article("https://a.com/0", "common story rewritten"))
+            for query in ("common", "story", "rewritten", "number5"):
+                expected = dict(reference.search(query, num_results=20))
+                for url, score in self.index.search(query, num_results=20):
+                    self.assertAlmostEqual(score, expected[url])
+        finally:
+            reference.close()
+
+    def test_get_article(self):
+        self.index.add(article("https://a.com/x", "alpha", title="Title"))
+        self.assertEqual(self.index.get_article("https://a.com/x")["title"], "Title")
+        self.assertIsNone(self.index.get_article("https://missing.com/"))
+
+    def test_search_while_documents_are_replaced(self):
+        for i in range(20):
+            self.index.add(article(f"https://a.com/{i}", f"shared topic story {i}"))
+        stop = threading.Event()
+        errors = []
+
+        def replace():
+            version = 0
+            while not stop.is_set():
+                version += 1
+                try:
+                    self.index.add(article(f"https://a.com/{version % 20}", f"shared topic story v{version}"))
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+
+        writer = threading.Thread(target=replace)
+        writer.start()
+        try:
+            for _ in range(300):
+                self.assertEqual(len(self.urls("shared topic", num_results=20)), 20)
+        finally:
+            stop.set()
+            writer.join()
+        self.assertEqual(errors, [])
+
+    def test_index_backend_only_supplies_search_hits(self):
+        self.index.add(article("https://a.com/x", "alpha beta"))
+        backend = IndexBackend(self.index)
+        self.assertEqual(backend.search("alpha"), ["https://a.com/x"])
+        # Content must come from the TTL'd article cache or a download, never the index
+        self.assertIsNone(backend.get_article("https://a.com/x"))
+
+
+if __name__ == "__main__":
+    unittest.main()
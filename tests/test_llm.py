@@ -0,0 +1,54 @@
+import asyncio
+import json
+import unittest
+
+from src.core.llm import FakeLLMClient, canned_response
+from src.core.source_retrieval import decompose_prompt, verification_prompt
+
+
+class CannedResponseTest(unittest.TestCase):
+    def test_decomposition_reply(self):
+        self.assertEqual(json.loads(canned_response(decompose_prompt("Water is wet"))), {"search_queries": []})
+
+    def test_verdict_follows_the_prompt_schema(self):
+        reply = json.loads(canned_response(verification_prompt("Water is wet", "Some context")))
+        self.assertEqual(set(reply), {
+            "claim", "verdict", "confidence", "explanation",
+            "supporting_evidence", "contrary_evidence", "limitations",
+        })
+        self.assertEqual(reply["claim"], "Water is wet")
+        self.assertIn(reply["verdict"], {"TRUE", "FALSE", "PARTIALLY TRUE", "INSUFFICIENT EVIDENCE"})
+        self.assertIn(reply["confidence"], {"HIGH", "MEDIUM", "LOW"})
+        for key in ("supporting_evidence", "contrary_evidence", "limitations"):
+            self.assertIsInstance(reply[key], list)
+
+
+class FakeLLMClientTest(unittest.TestCase):
+    def test_counts_calls_and_tokens(self):
+        client = FakeLLMClient()
+        response = client.generate(verification_prompt("Water is wet", "context"))
+        self.assertGreater(response.prompt_tokens, 0)
+        stats = client.stats()
+        self.assertEqual(stats["calls"], 1)
+        self.assertEqual(stats["prompt_tokens"], response.prompt_tokens)
+        self.assertEqual(stats["output_tokens"], response.output_tokens)
+
+    def test_tracks_peak_concurrency(self):
+        client = FakeLLMClient(latency=0.05)
+
+        async def run():
+            await asyncio.gather(*(client.generate_async("prompt") for _ in range(5)))
+
+        asyncio.run(run())
+        self.assertEqual(client.stats()["peak_in_flight"], 5)
+
+    def test_injected_failures_raise(self):
+        client = FakeLLMClient(failure_rate=1.0)
+        with self.assertRaises(RuntimeError):
+            client.generate("prompt")
+        self.assertEqual(client.stats()["failures"], 1)
+        self.assertEqual(client.in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
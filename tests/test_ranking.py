@@ -0,0 +1,45 @@
+import unittest
+from types import SimpleNamespace
+
+from src.core.context import ContextBuilder
+from src.core.ranking import BM25, bm25_passage_scores, tokenize
+
+
+class TokenizeTest(unittest.TestCase):
+    def test_stopwords_and_possessives_are_removed(self):
+        self.assertEqual(tokenize("Apple's sales of the iPhone were up 1.5%"), ["apple", "sales", "iphone", "1.5"])
+
+
+class BM25Test(unittest.TestCase):
+    def test_documents_rank_by_query_term_weight(self):
+        index = BM25([
+            "iphone sales rose in fiscal 2024",
+            "iphone iphone sales",
+            "bitcoin rally lifts microstrategy",
+            "sales of cars",
+        ])
+        scores = index.score("iPhone sales")
+        self.assertEqual(sorted(range(4), key=lambda i: scores[i], reverse=True)[:2], [1, 0])
+        self.assertEqual(scores[2], 0)
+        # The rarer term outweighs the common one
+        self.assertGreater(index.score("iphone")[0], index.score("sales")[0])
+
+    def test_empty_corpus(self):
+        self.assertEqual(BM25([]).score("anything"), [])
+
+
+class PassageRankingTest(unittest.TestCase):
+    def test_relevant_passage_is_chosen_over_lead(self):
+        content = "\n\n".join([
+            "The company held its annual meeting with shareholders in the spring.",
+            "Analysts discussed the weather and unrelated market news at length today.",
+            "MicroStrategy shares jumped as the bitcoin rally continued this year.",
+        ])
+        articles = [SimpleNamespace(url="https://a.com/x", title="A", source="a.com", content=content)]
+        builder = ContextBuilder(passage_tokens=20, scorer=bm25_passage_scores, top_k=1)
+        selected = builder.select(articles, ["MicroStrategy benefited from the bitcoin rally"])
+        self.assertEqual([p.passage_index for p in selected], [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+
+from src.core.rate_limit import HostScheduler, RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_reservations_queue_in_arrival_order(self):
+        limiter = RateLimiter(rate=10, burst=1)
+        waits = [limiter.reserve() for _ in range(3)]
+        self.assertEqual(waits[0], 0)
+        self.assertAlmostEqual(waits[1], 0.1, delta=0.02)
+        self.assertAlmostEqual(waits[2], 0.2, delta=0.02)
+
+    def test_penalize_pushes_back_the_next_token(self):
+        limiter = RateLimiter(rate=10, burst=2)
+        limiter.penalize(5)
+        self.assertAlmostEqual(limiter.reserve(), 5.1, delta=0.02)
+
+    def test_zero_rate_is_unlimited(self):
+        limiter = RateLimiter(rate=0)
+        limiter.penalize(5)
+        self.assertEqual([limiter.reserve() for _ in range(5)], [0.0] * 5)
+
+
+class HostSchedulerTest(unittest.TestCase):
+    def run_slots(self, scheduler, urls, hold=0.1):
+        """Enter a slot per URL on its own thread; returns (url, entered, left) per request."""
+        timeline = []
+        lock = threading.Lock()
+
+        def request(url):
+            with scheduler.slot(url):
+                entered = time.monotonic()
+                time.sleep(hold)
+            with lock:
+                timeline.append((url, entered, time.monotonic()))
+
+        threads = [threading.Thread(target=request, args=(url,)) for url in urls]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return timeline
+
+    @staticmethod
+    def peak_concurrency(timeline):
+        events = sorted([(entered, 1) for _, entered, _ in timeline] + [(left, -1) for _, _, left in timeline])
+        peak = current = 0
+        for _, change in events:
+            current += change
+            peak = max(peak, current)
+        return peak
+
+    def test_host_of_ignores_www_and_port(self):
+        self.assertEqual(HostScheduler.host_of("https://www.Example.com:8443/a"), "example.com")
+        self.assertEqual(HostScheduler.host_of("example.com"), "example.com")
+
+    def test_host_limits_override_defaults(self):
+        scheduler = HostScheduler(rate_per_host=1, max_per_host=2, host_limits={"https://search.com/html/": (5, 1, 1)})
+        self.assertEqual(scheduler.limiter("https://search.com/?q=x").rate, 5)
+        self.assertEqual(scheduler.max_concurrent("https://search.com/"), 1)
+        self.assertEqual(scheduler.max_concurrent("https://news.com/"), 2)
+
+    def test_same_host_requests_are_spaced_by_its_rate(self):
+        scheduler = HostScheduler(rate_per_host=20, burst_per_host=1, max_per_host=4)
+        timeline = self.run_slots(scheduler, ["https://a.com/1", "https://a.com/2", "https://a.com/3"], hold=0)
+        entered = sorted(entered for _, entered, _ in timeline)
+        self.assertGreaterEqual(entered[1] - entered[0], 0.04)
+        self.assertGreaterEqual(entered[2] - entered[1], 0.04)
+
+    def test_per_host_and_global_caps(self):
+        scheduler = HostScheduler(rate_per_host=0, max_per_host=1, max_total=2)
+        same_host = self.run_slots(scheduler, ["https://a.com/1", "https://a.com/2"])
+        self.assertEqual(self.peak_concurrency(same_host), 1)
+        many_hosts = self.run_slots(scheduler, [f"https://host{i}.com/" for i in range(4)])
+        self.assertEqual(self.peak_concurrency(many_hosts), 2)
+
+    def test_backoff_delays_only_that_host(self):
+        scheduler = HostScheduler(rate_per_host=10, burst_per_host=2)
+        scheduler.backoff("https://www.slow.com/story", 30)
+        self.assertGreater(scheduler.limiter("https://slow.com/other").reserve(), 29)
+        self.assertEqual(scheduler.limiter("https://fast.com/").reserve(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
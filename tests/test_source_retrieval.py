@@ -0,0 +1,144 @@
+import asyncio
+import time
+import unittest
+
+from src.core.async_retrieval import AsyncSourceRetriever
+from src.core.search_backends import SearchBackend
+from src.core.source_retrieval import SourceRetriever
+from src.core.timing import StageTimer
+
+STORY = " ".join(f"word{i}" for i in range(200))
+
+
+class SlowCorpus(SearchBackend):
+    """Backend serving its own articles, the top-ranked one slowest."""
+
+    name = "slow"
+
+    def __init__(self, documents, delays):
+        self.documents = documents
+        self.delays = delays
+
+    def search(self, query, num_results=10):
+        return [document["url"] for document in self.documents][:num_results]
+
+    def get_article(self, url):
+        for document, delay in zip(self.documents, self.delays):
+            if document["url"] == url:
+                time.sleep(delay)
+                return document
+        return None
+
+
+def corpus():
+    return SlowCorpus(
+        [
+            {"url": "https://first.com/story", "title": "First", "content": STORY},
+            {"url": "https://other.com/unrelated", "title": "Other", "content": "entirely different text " * 20},
+            {"url": "https://second.com/copy", "title": "Copy", "content": STORY + " syndicated"},
+        ],
+        [0.3, 0.0, 0.0],
+    )
+
+
+def run_async(retriever, call):
+    """await call(async_retriever) on a fresh loop, then close both retrievers."""
+    async def run():
+        async_retriever = AsyncSourceRetriever(retriever)
+        try:
+            return await call(async_retriever)
+        finally:
+            await async_retriever.close()
+
+    try:
+        return asyncio.run(run())
+    finally:
+        retriever.close()
+
+
+class BrokenBackend(SearchBackend):
+    name = "broken"
+
+    def search(self, query, num_results=10):
+        raise RuntimeError("backend down")
+
+
+class SearchErrorTest(unittest.TestCase):
+    def assert_error_isolated(self, urls, timer):
+        self.assertEqual(urls[0], "https://first.com/story")
+        errors = {record["backend"]: record.get("error") for record in timer.records()}
+        self.assertEqual(errors, {"slow": None, "broken": "RuntimeError: backend down"})
+
+    def test_failing_backend_does_not_sink_search_many(self):
+        retriever = SourceRetriever(search_backends=[corpus(), BrokenBackend()])
+        try:
+            timer = StageTimer()
+            self.assert_error_isolated(retriever.search_many(["story"], 3, timer), timer)
+        finally:
+            retriever.close()
+
+    def test_failing_backend_does_not_sink_search_many_async(self):
+        timer = StageTimer()
+        urls = run_async(
+            SourceRetriever(search_backends=[corpus(), BrokenBackend()]),
+            lambda async_retriever: async_retriever.search_many(["story"], 3, timer)
+        )
+        self.assert_error_isolated(urls, timer)
+
+
+class DuplicateCollapseTest(unittest.TestCase):
+    def assert_top_ranked_copy_kept(self, df):
+        self.assertEqual(df["url"].tolist(), ["https://first.com/story", "https://other.com/unrelated"])
+        self.assertEqual(df.iloc[0]["duplicate_urls"], ["https://second.com/copy"])
+
+    def test_highest_ranked_copy_is_representative(self):
+        retriever = SourceRetriever(search_backends=[corpus()])
+        try:
+            self.assert_top_ranked_copy_kept(retriever.search_and_process_articles("story", 3))
+        finally:
+            retriever.close()
+
+    def test_highest_ranked_copy_is_representative_async(self):
+        df = run_async(
+            SourceRetriever(search_backends=[corpus()]),
+            lambda async_retriever: async_retriever.search_and_process_articles("story", 3)
+        )
+        self.assert_top_ranked_copy_kept(df)
+
+    def assert_streamed_before_slow_page(self, events):
+        kinds = [(event.kind, event.index) for event in events if event.kind in ("article", "duplicates")]
+        # The slow top-ranked page doesn't hold back the others
+        self.assertEqual(sorted(kinds[:2]), [("article", 1), ("article", 2)])
+        self.assertEqual(kinds[2:], [("article", 0), ("duplicates", None)])
+        self.assertEqual(events[-2].duplicates, {2: 0})
+
+    def test_articles_stream_in_completion_order(self):
+        retriever = SourceRetriever(search_backends=[corpus()])
+        try:
+            self.assert_streamed_before_slow_page(list(retriever.iter_search_and_process_articles("story", 3)))
+        finally:
+            retriever.close()
+
+    def test_articles_stream_in_completion_order_async(self):
+        async def events(async_retriever):
+            return [event async for event in async_retriever.iter_search_and_process_articles("story", 3)]
+
+        self.assert_streamed_before_slow_page(run_async(SourceRetriever(search_backends=[corpus()]), events))
+
+
+
+class ParsePoolTest(unittest.TestCase):
+    def test_pool_is_created_up_front_and_spawns_workers(self):
+        retriever = SourceRetriever(parse_workers=1)
+        try:
+            self.assertIsNotNone(retriever._parse_pool)
+            self.assertEqual(retriever._parse_pool._mp_context.get_start_method(), "spawn")
+            html = f"<html><head><title>Story</title></head><body><article><p>{STORY}</p></article></body></html>"
+            article = retriever.parse_article("https://a.com/story", html.encode("utf-8"), "utf-8")
+            self.assertEqual(article.title, "Story")
+        finally:
+            retriever.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from src.core.url_utils import canonicalize_url, dedupe_urls, url_key
+
+
+class UrlKeyTest(unittest.TestCase):
+    def test_variants_share_a_key(self):
+        variants = [
+            "https://www.example.com/story",
+            "http://example.com/story/",
+            "https://amp.example.com/story/amp",
+            "https://example.com/story?utm_source=x#comments",
+        ]
+        self.assertEqual({url_key(url) for url in variants}, {"https://example.com/story"})
+
+    def test_leading_amp_segment_is_dropped(self):
+        self.assertEqual(
+            url_key("https://www.cnbc.com/amp/2024/12/01/story.html"),
+            url_key("https://www.cnbc.com/2024/12/01/story.html"),
+        )
+        self.assertEqual(url_key("https://example.com/ampere/story"), "https://example.com/ampere/story")
+
+    def test_query_parameters_are_kept_and_sorted(self):
+        self.assertEqual(canonicalize_url("https://Example.com/a?b=2&a=1&fbclid=z"), "https://example.com/a?a=1&b=2")
+
+    def test_non_http_urls_are_rejected(self):
+        self.assertIsNone(url_key("mailto:someone@example.com"))
+        self.assertIsNone(url_key("/relative/path"))
+
+
+class DedupeUrlsTest(unittest.TestCase):
+    def test_keeps_first_seen_original_url(self):
+        urls = [
+            "http://example.com/story;jsessionid=1",
+            "https://www.example.com/story",
+            "https://amp.news.com/item/amp",
+            "https://news.com/item",
+            "ftp://example.com/file",
+        ]
+        self.assertEqual(dedupe_urls(urls), ["http://example.com/story;jsessionid=1", "https://amp.news.com/item/amp"])
+
+
+if __name__ == "__main__":
+    unittest.main()